@@ -3,5 +3,6 @@
 # Apply migrations
 python manage.py migrate --noinput
 
-# Start Gunicorn
-exec gunicorn mysite.wsgi:application --bind 0.0.0.0:8000 --workers 2
\ No newline at end of file
+# Start Uvicorn. Async solve views await the solver pool, one event loop per worker holds many in-flight requests.
+# Django has no lifespan support; proxy headers are trusted from FORWARDED_ALLOW_IPS (default 127.0.0.1)
+exec uvicorn mysite.asgi:application --host 0.0.0.0 --port 8000 --workers 2 --lifespan off --proxy-headers
\ No newline at end of file
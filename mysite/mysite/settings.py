@@ -71,6 +71,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "mysite.wsgi.application"
+ASGI_APPLICATION = "mysite.asgi.application"
 
 
 # Database
@@ -88,6 +89,18 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Solutions are shared between web server workers with a memcached or redis backend
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("DJANGO_CACHE_LOCATION", ""),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -135,6 +148,16 @@ AUTH_USER_MODEL = "sudoku_solver.User"
 
 LOGIN_URL = "/sudoku-solver/login/"
 
+# Solver
+SOLVER_POOL_WORKERS = int(os.getenv("SOLVER_POOL_WORKERS", "0")) or os.cpu_count() or 1
+SOLVER_POOL_MAX_TASKS = int(os.getenv("SOLVER_POOL_MAX_TASKS", "1000"))
+SOLVE_TIMEOUT = float(os.getenv("SOLVE_TIMEOUT", "5"))
+SOLVE_BATCH_MAX_SIZE = int(os.getenv("SOLVE_BATCH_MAX_SIZE", "1000"))
+SOLUTION_CACHE_SIZE = int(os.getenv("SOLUTION_CACHE_SIZE", "4096"))
+SOLUTION_CACHE_TIMEOUT = float(os.getenv("SOLUTION_CACHE_TIMEOUT", "86400"))
+HINT_CACHE_TIMEOUT = float(os.getenv("HINT_CACHE_TIMEOUT", "86400"))
+SOLVER_PROFILING = os.getenv("SOLVER_PROFILING", "") == "True"
+
 if DEBUG:
     INSTALLED_APPS.append("debug_toolbar")
     MIDDLEWARE.append("debug_toolbar.middleware.DebugToolbarMiddleware")
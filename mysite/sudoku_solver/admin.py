@@ -9,7 +9,7 @@ admin.site.register(models.User, UserAdmin)
 @admin.register(models.Board)
 class BoardAdmin(admin.ModelAdmin):
     form = forms.AdminBoardForm
-    list_display = ("id", "user", "description", "created", "changed")
+    list_display = ("id", "user", "description", "givens_count", "difficulty", "created", "changed")
     autocomplete_fields = ("user",)
     list_filter = (("created", admin.DateFieldListFilter), ("changed", admin.DateFieldListFilter))
     search_fields = ("id", "description", "created", "changed")
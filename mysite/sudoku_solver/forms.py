@@ -1,3 +1,4 @@
+import re
 from typing import Any
 
 from django import forms
@@ -5,7 +6,10 @@ from django.contrib.auth.forms import AuthenticationForm, PasswordChangeForm, Us
 from django.contrib.auth.password_validation import password_validators_help_text_html
 from django.core.validators import RegexValidator
 
-from . import fields, models, widgets
+from . import fields, models, solving, widgets
+from .utils import board_utils
+
+BOARD_PATTERN = re.compile(r"^\d{81}$")
 
 
 class SignInForm(AuthenticationForm):
@@ -46,23 +50,44 @@ class ChangePasswordForm(PasswordChangeForm):
 class BoardForm(forms.ModelForm):
     description = forms.CharField(required=True)
     board = forms.CharField(
-        required=True, validators=[RegexValidator(regex=r"^\d{81}$", message="Board must be exactly 81 digits (0-9).")]
+        required=True,
+        validators=[RegexValidator(regex=BOARD_PATTERN, message="Board must be exactly 81 digits (0-9).")],
     )
 
-    def __init__(self, *args: Any, user: models.User | None = None, **kwargs: Any):
+    def __init__(
+        self,
+        *args: Any,
+        user: models.User | None = None,
+        analysis: solving.GivensAnalysis | None = None,
+        **kwargs: Any,
+    ):
+        """analysis: of the bound board, computed by the view (a solver pool round trip), None when it failed"""
         super().__init__(*args, **kwargs)
         self._user = user
+        self._analysis = analysis
+        self._givens: list[int] = []
 
     class Meta:
         model = models.Board
         fields = ("description", "board")
 
     def clean_board(self) -> str:
-        return ",".join(f"-{c}" if c != "0" else c for c in self.cleaned_data["board"])
+        board = self.cleaned_data["board"]
+        self._givens = [int(c) for c in board]
+        if self._analysis is None:
+            raise forms.ValidationError("Board uniqueness check failed, try again later.")
+        solutions = self._analysis["solution_count"]
+        if not solutions:
+            raise forms.ValidationError("Board has no solution.")
+        if solutions > 1:
+            raise forms.ValidationError("Board has more than one solution.")
+        return board_utils.encode_givens(self._givens)
 
     def save(self, commit: bool = True) -> models.User:
         instance = super().save(commit=False)
         instance.user = self._user
+        if self._analysis is not None:
+            instance.set_analysis(self._givens, self._analysis)
         if commit:
             instance.save()
         return instance
@@ -0,0 +1,37 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from ... import models, solving
+
+
+class Command(BaseCommand):
+    help = "Compute solution, solution count, givens count, difficulty and canonical digest of saved boards"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--all", action="store_true", help="Recompute already analyzed boards too")
+        parser.add_argument("--batch-size", type=int, default=500, help="Boards saved per query")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        boards = models.Board.objects.order_by("id")
+        if not options["all"]:
+            boards = boards.filter(solution_count__isnull=True)
+        batch_size = options["batch_size"]
+        batch: list[models.Board] = []
+        count = 0
+        for board in boards.only("id", "board").iterator(chunk_size=batch_size):
+            givens = board.givens
+            board.set_analysis(givens, solving.analyze_givens(givens))
+            batch.append(board)
+            if len(batch) >= batch_size:
+                count += self._save(batch)
+        count += self._save(batch)
+        self.stdout.write(self.style.SUCCESS(f"Analyzed {count} boards"))
+
+    def _save(self, batch: list[models.Board]) -> int:
+        models.Board.objects.bulk_update(
+            batch, ["solution", "solution_count", "givens_count", "difficulty", "canonical_digest"]
+        )
+        count = len(batch)
+        batch.clear()
+        return count
@@ -0,0 +1,120 @@
+import timeit
+import tracemalloc
+from functools import partial
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from ...solver import BruteForcer, DancingLinks, Solver, StepSolver
+from ...sudoku import Container, Grid
+from ...utils import board_utils
+from ...utils.symmetry import SymmetryTransform, canonicalize
+
+SAMPLE_BOARD = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+# steps through most strategies before the step solver gets stuck
+STEP_BOARD = "000000400006500030980400010009004802800060000005090000530600000190300050000045073"
+
+
+class Command(BaseCommand):
+    help = "Run solver performance benchmarks"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("target", choices=sorted(self._get_benchmarks()))
+        parser.add_argument("-n", "--number", type=int, default=1000, help="Iterations per measurement")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self._get_benchmarks()[options["target"]](options["number"])
+
+    def _get_benchmarks(self) -> dict[str, Callable[[int], None]]:
+        return {
+            "grid": self._benchmark_grid,
+            "solve": self._benchmark_solve,
+            "canonical": self._benchmark_canonical,
+            "parse": self._benchmark_parse,
+            "dirty": self._benchmark_dirty,
+            "schedule": self._benchmark_schedule,
+        }
+
+    def _benchmark_grid(self, number: int) -> None:
+        def construct() -> Grid:
+            return Grid(SAMPLE_BOARD)
+
+        def construct_views() -> tuple[Container, ...]:
+            return Grid(SAMPLE_BOARD).containers
+
+        def construct_candidates() -> Grid:
+            grid = Grid(SAMPLE_BOARD)
+            grid.init_candidates()
+            return grid
+
+        grid = construct_candidates()
+        tracemalloc.start()
+        grids = [construct_candidates() for _ in range(number)]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del grids
+        self._write("bytes/grid", size / number)
+        self._write("us/construct", self._measure(construct, number))
+        self._write("us/construct with views", self._measure(construct_views, number))
+        self._write("us/construct with candidates", self._measure(construct_candidates, number))
+        self._write("us/clone", self._measure(grid.clone, number))
+
+    def _benchmark_solve(self, number: int) -> None:
+        solver_classes: tuple[type[Solver], ...] = (BruteForcer, DancingLinks)
+        for solver_class in solver_classes:
+            name = f"us/solve {solver_class(Grid(SAMPLE_BOARD))}"
+            self._write(name, self._measure(partial(self._solve, solver_class), number))
+
+    def _benchmark_canonical(self, number: int) -> None:
+        givens = Grid(SAMPLE_BOARD).state.givens
+        transform = SymmetryTransform(
+            True, (5, 3, 4, 8, 7, 6, 0, 2, 1), (2, 0, 1, 6, 7, 8, 4, 3, 5), (0, *range(9, 0, -1))
+        )
+        duration = self._measure(partial(canonicalize, givens), number)
+        self._write("us/canonicalize", duration)
+        self._write(
+            "us/canonicalize transformed", self._measure(partial(canonicalize, transform.apply(givens)), number)
+        )
+        self._write("boards/s", 1_000_000 / duration)
+
+    def _benchmark_parse(self, number: int) -> None:
+        grid = Grid(SAMPLE_BOARD)
+        grid.init_candidates()
+        data = board_utils.encode_board(grid)
+        packed = board_utils.pack_board(grid)
+        self._write("us/parse", self._measure(partial(board_utils.parse_board, data), number))
+        self._write("us/parse packed", self._measure(partial(board_utils.parse_packed, packed), number))
+        self._write("us/decode grid", self._measure(partial(board_utils.decode_board, data), number))
+        self._write("us/decode grid packed", self._measure(partial(board_utils.unpack_board, packed), number))
+
+    def _benchmark_dirty(self, number: int) -> None:
+        for track_changes in (False, True):
+            name = "tracked" if track_changes else "full scan"
+            self._write(f"us/step through {name}", self._measure(partial(self._step, track_changes), number))
+        self._write("regions skipped/run", self._step(True))
+
+    def _benchmark_schedule(self, number: int) -> None:
+        # adaptive runs learn from the previous ones through the shared scheduler stats
+        for strict in (True, False):
+            name = "strict" if strict else "adaptive"
+            self._write(f"us/step through {name}", self._measure(partial(self._step, strict=strict), number))
+        for name, stats in StepSolver(Grid(STEP_BOARD)).scheduler.stats.items():
+            self._write(f"us/hit {name}", stats.expected_cost * 1e6)
+
+    def _step(self, track_changes: bool = True, strict: bool = True) -> int:
+        """Step solve until solved or stuck, regions skipped by the strategies"""
+        grid = Grid(STEP_BOARD)
+        grid.init_candidates()
+        solver = StepSolver(grid, strict=strict, track_changes=track_changes)
+        while not grid.is_solved and solver.solve():
+            pass
+        return sum(strategy.skipped for strategy in solver.strategies)
+
+    def _solve(self, solver_class: type[Solver]) -> bool:
+        return solver_class(Grid(SAMPLE_BOARD)).solve()
+
+    def _measure(self, func: Callable[[], object], number: int) -> float:
+        return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+    def _write(self, name: str, value: float) -> None:
+        self.stdout.write(f"{name:<32}{value:>12.1f}")
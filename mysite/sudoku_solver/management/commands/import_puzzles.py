@@ -0,0 +1,150 @@
+import os
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, TextIO
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+
+from ... import models, solving
+from ...solver_pool import SolverPool
+from ...utils import board_utils
+
+
+class Command(BaseCommand):
+    help = (
+        "Import puzzles of a text file, one 81 characters puzzle per line (digits, '.' or '0' for empty cells). "
+        "The file is streamed and boards are saved in batches, memory doesn't depend on the file size. "
+        "Puzzles are analyzed and deduped across worker processes"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", type=Path, help="Puzzles file, - for stdin")
+        parser.add_argument("--user", required=True, help="Username of the boards owner")
+        parser.add_argument("--description", help="Boards description prefix, the file name by default")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Boards saved per transaction")
+        parser.add_argument(
+            "--dedupe", action="store_true", help="Skip puzzles equivalent to imported or user's boards by symmetry"
+        )
+        parser.add_argument(
+            "--analyze", action="store_true", help="Store boards analysis, skip puzzles without a unique solution"
+        )
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+        parser.add_argument("--timeout", type=float, default=600.0, help="Seconds allowed to process a batch")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            user = models.User.objects.get(username=options["user"])
+        except models.User.DoesNotExist:
+            raise CommandError(f"User {options['user']!r} does not exist")
+        if options["workers"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--workers and --batch-size must be positive")
+        path: Path = options["path"]
+        self._description = options["description"] or ("stdin" if str(path) == "-" else path.name)
+        self._analyze = options["analyze"]
+        self._dedupe = options["dedupe"]
+        self._timeout = options["timeout"]
+        self._invalid = self._skipped = self._failed = self._imported = 0
+        self._started = time.perf_counter()
+        self._pool = SolverPool(options["workers"], max_tasks=100) if self._analyze or self._dedupe else None
+        try:
+            if self._dedupe:
+                self._fill_digests(user, options["batch_size"])
+            if str(path) == "-":
+                self._import(sys.stdin, user, options["batch_size"])
+            else:
+                try:
+                    with path.open(encoding="ascii", errors="replace") as file:
+                        self._import(file, user, options["batch_size"])
+                except OSError as e:
+                    raise CommandError(f"Can't read {path}: {e}")
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+        self.stdout.write(self.style.SUCCESS(f"Done. {self._get_progress()}"))
+        if not self._analyze and self._imported:
+            self.stdout.write("Run backfill_boards to store the imported boards analysis")
+
+    def _fill_digests(self, user: models.User, batch_size: int) -> None:
+        """Store the canonical digest of the user's boards without one, so they are found by _dedupe"""
+        boards = models.Board.objects.filter(user=user, canonical_digest__isnull=True).order_by("id")
+        rows = boards.only("id", "board").iterator(chunk_size=batch_size)
+        while batch := list(islice(rows, batch_size)):
+            digests = solving.offload_get_canonical_digests(
+                [board.givens for board in batch], pool=self._pool, timeout=self._timeout
+            )
+            for board, digest in zip(batch, digests):
+                board.canonical_digest = digest
+            models.Board.objects.bulk_update(
+                [board for board in batch if board.canonical_digest], ["canonical_digest"]
+            )
+
+    def _import(self, file: TextIO, user: models.User, batch_size: int) -> None:
+        puzzles = self._read_puzzles(file)
+        while batch := list(islice(puzzles, batch_size)):
+            boards = self._get_boards(batch, user)
+            with transaction.atomic():
+                models.Board.objects.bulk_create(boards, batch_size=batch_size)
+            self._imported += len(boards)
+            self.stdout.write(self._get_progress())
+
+    def _read_puzzles(self, lines: Iterable[str]) -> Iterator[tuple[int, tuple[int, ...]]]:
+        for line_number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                yield line_number, board_utils.parse_puzzle(line.split(maxsplit=1)[0])
+            except board_utils.BoardParseError as e:
+                self._invalid += 1
+                self.stderr.write(f"Line {line_number}: invalid puzzle: {e}")
+
+    def _get_boards(self, batch: list[tuple[int, tuple[int, ...]]], user: models.User) -> list[models.Board]:
+        puzzles = [givens for _, givens in batch]
+        analyses: list[solving.GivensAnalysis | None] = [None] * len(batch)
+        digests: list[str | None] = [None] * len(batch)
+        if self._analyze:
+            analyses = solving.offload_analyze_puzzles(puzzles, pool=self._pool, timeout=self._timeout)
+            digests = [analysis["canonical_digest"] if analysis else None for analysis in analyses]
+        elif self._dedupe:
+            digests = solving.offload_get_canonical_digests(puzzles, pool=self._pool, timeout=self._timeout)
+        # digests of saved boards and of the batch boards kept so far
+        seen: set[str | None] = set()
+        if self._dedupe:
+            existing = models.Board.objects.filter(user=user, canonical_digest__in={*digests} - {None})
+            seen.update(existing.values_list("canonical_digest", flat=True))
+        boards = []
+        for (line_number, givens), analysis, digest in zip(batch, analyses, digests):
+            if (self._analyze or self._dedupe) and digest is None:
+                self._failed += 1
+                self.stderr.write(f"Line {line_number}: puzzle processing failed or timed out")
+                continue
+            if analysis is not None and analysis["solution_count"] != 1:
+                self._invalid += 1
+                self.stderr.write(f"Line {line_number}: puzzle has {analysis['solution_count']} solutions")
+                continue
+            if self._dedupe:
+                if digest in seen:
+                    self._skipped += 1
+                    continue
+                seen.add(digest)
+            board = models.Board(
+                user=user,
+                board=board_utils.encode_givens(givens),
+                description=f"{self._description} #{line_number}",
+                canonical_digest=digest,
+            )
+            if analysis is not None:
+                board.set_analysis(givens, analysis)
+            boards.append(board)
+        return boards
+
+    def _get_progress(self) -> str:
+        elapsed = time.perf_counter() - self._started
+        rate = self._imported / elapsed if elapsed else 0.0
+        return (
+            f"Imported {self._imported} boards, {self._skipped} duplicates, {self._invalid} invalid, "
+            f"{self._failed} failed, {elapsed:.1f}s, {rate:.0f} boards/s"
+        )
@@ -0,0 +1,95 @@
+import os
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ... import models, solving
+from ...solver import Rating
+from ...solver_pool import SolverPool
+from ...utils import board_utils
+
+
+class Command(BaseCommand):
+    help = (
+        "Rate puzzles difficulty across worker processes. "
+        "Rates saved unique solution boards without a difficulty (all with --all), "
+        "boards not analyzed yet are left to backfill_boards. Or prints ratings of a puzzles file"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", nargs="?", type=Path, help="Puzzles file, one 81 characters puzzle per line")
+        parser.add_argument("--all", action="store_true", help="Rate already rated boards too")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Puzzles rated and saved at once")
+        parser.add_argument("--timeout", type=float, default=600.0, help="Seconds allowed to rate a batch")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["workers"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--workers and --batch-size must be positive")
+        self._pool = SolverPool(options["workers"], max_tasks=100)
+        self._timeout = options["timeout"]
+        self._rated = self._failed = 0
+        self._started = time.perf_counter()
+        try:
+            if options["path"] is None:
+                self._rate_boards(options["all"], options["batch_size"])
+            else:
+                self._rate_file(options["path"], options["batch_size"])
+        finally:
+            self._pool.shutdown()
+        self.stderr.write(self.style.SUCCESS(f"Done. {self._get_progress()}"))
+
+    def _rate_boards(self, rate_all: bool, batch_size: int) -> None:
+        # like the analysis on save: only unique solution givens have a difficulty
+        boards = models.Board.objects.filter(solution_count=1).order_by("id")
+        if not rate_all:
+            boards = boards.filter(difficulty__isnull=True)
+        rows = boards.only("id", "board").iterator(chunk_size=batch_size)
+        while batch := list(islice(rows, batch_size)):
+            rated = []
+            for board, rating in zip(batch, self._rate([board.givens for board in batch])):
+                if rating is not None:
+                    board.difficulty = rating.difficulty
+                    rated.append(board)
+            models.Board.objects.bulk_update(rated, ["difficulty"])
+            self.stderr.write(self._get_progress())
+
+    def _rate_file(self, path: Path, batch_size: int) -> None:
+        try:
+            with path.open(encoding="ascii", errors="replace") as file:
+                puzzles = self._read_puzzles(file)
+                while batch := list(islice(puzzles, batch_size)):
+                    for puzzle, rating in zip(batch, self._rate(batch)):
+                        line = "".join(map(str, puzzle))
+                        if rating is None:
+                            self.stdout.write(f"{line},failed")
+                        else:
+                            self.stdout.write(f"{line},{rating.tier},{rating.score},{rating.strategy or ''}")
+                    self.stderr.write(self._get_progress())
+        except OSError as e:
+            raise CommandError(f"Can't read {path}: {e}")
+
+    def _read_puzzles(self, lines: Iterable[str]) -> Iterator[tuple[int, ...]]:
+        for line_number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                yield board_utils.parse_puzzle(line.split(maxsplit=1)[0])
+            except board_utils.BoardParseError as e:
+                self.stderr.write(f"Line {line_number}: invalid puzzle: {e}")
+
+    def _rate(self, puzzles: list[tuple[int, ...]]) -> list[Rating | None]:
+        ratings = solving.offload_rate_puzzles(puzzles, pool=self._pool, timeout=self._timeout)
+        failed = ratings.count(None)
+        self._failed += failed
+        self._rated += len(ratings) - failed
+        return ratings
+
+    def _get_progress(self) -> str:
+        elapsed = time.perf_counter() - self._started
+        rate = self._rated / elapsed if elapsed else 0.0
+        return f"Rated {self._rated} puzzles, {self._failed} failed, {elapsed:.1f}s, {rate:.0f} puzzles/s"
@@ -0,0 +1,62 @@
+# Generated by Django 5.2 on 2026-10-18 14:00
+
+import sudoku_solver.models
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+
+
+def _copy_boards(Board: type[models.Model], source: str, target: str, batch_size: int = 1000) -> None:
+    boards = []
+    for board in Board._default_manager.only('id', source).iterator(chunk_size=batch_size):
+        setattr(board, target, getattr(board, source))
+        boards.append(board)
+        if len(boards) >= batch_size:
+            Board._default_manager.bulk_update(boards, [target])
+            boards = []
+    Board._default_manager.bulk_update(boards, [target])
+
+
+def pack_boards(apps: StateApps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    Board = apps.get_model('sudoku_solver', 'Board')
+    _copy_boards(Board, 'board', 'board_packed')
+
+
+def unpack_boards(apps: StateApps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    Board = apps.get_model('sudoku_solver', 'Board')
+    _copy_boards(Board, 'board_packed', 'board')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sudoku_solver', '0002_board_analysis'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='board_packed',
+            field=sudoku_solver.models.PackedBoardField(max_length=162, null=True),
+        ),
+        migrations.AlterField(
+            model_name='board',
+            name='board',
+            field=models.CharField(max_length=323, null=True),
+        ),
+        migrations.RunPython(pack_boards, unpack_boards),
+        migrations.RemoveField(
+            model_name='board',
+            name='board',
+        ),
+        migrations.RenameField(
+            model_name='board',
+            old_name='board_packed',
+            new_name='board',
+        ),
+        migrations.AlterField(
+            model_name='board',
+            name='board',
+            field=sudoku_solver.models.PackedBoardField(max_length=162),
+        ),
+    ]
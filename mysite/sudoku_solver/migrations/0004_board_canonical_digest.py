@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-18 02:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sudoku_solver', '0003_board_packed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='canonical_digest',
+            field=models.CharField(blank=True, editable=False, max_length=32, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='board',
+            index=models.Index(fields=['user', 'canonical_digest'], name='sudoku_solv_user_id_f973e9_idx'),
+        ),
+    ]
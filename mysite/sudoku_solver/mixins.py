@@ -1,9 +1,14 @@
 from typing import Any, Callable, Protocol
 
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
 from django.core.exceptions import ImproperlyConfigured
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect
 
+from . import forms, solving
+from .solver_pool import SolverPoolException
+
 type Url = str | Callable[..., Any] | SupportsGetAbsoluteUrl
 
 
@@ -24,3 +29,40 @@ class RedirectAuthenticatedMixin:
         if not self.authenticated_url:
             raise ImproperlyConfigured("No URL to redirect to. Provide a authenticated_url.")
         return self.authenticated_url
+
+
+class BoardAnalysisMixin:
+    """Async login required board form view. The posted board analysis is awaited in the solver pool,
+    then the sync form view runs in a thread with it: sync views of a worker share one thread,
+    a slow analysis doesn't hold it
+    """
+
+    board_analysis: solving.GivensAnalysis | None = None
+
+    async def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        return await self._handle(request, super().get, *args, **kwargs)  # type: ignore[misc]
+
+    async def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        board = request.POST.get("board")
+        if board is not None and forms.BOARD_PATTERN.match(board) and (await request.auser()).is_authenticated:
+            try:
+                self.board_analysis = await solving.aoffload_analyze_givens([int(c) for c in board])
+            except SolverPoolException:
+                self.board_analysis = None
+        return await self._handle(request, super().post, *args, **kwargs)  # type: ignore[misc]
+
+    async def put(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        return await self.post(request, *args, **kwargs)
+
+    def get_form_kwargs(self) -> dict[str, Any]:
+        kwargs: dict[str, Any] = super().get_form_kwargs()  # type: ignore[misc]
+        kwargs["user"] = self.request.user  # type: ignore[attr-defined]
+        kwargs["analysis"] = self.board_analysis
+        return kwargs
+
+    async def _handle(
+        self, request: HttpRequest, handler: Callable[..., HttpResponse], *args: Any, **kwargs: Any
+    ) -> HttpResponse:
+        if not (await request.auser()).is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await sync_to_async(handler)(request, *args, **kwargs)
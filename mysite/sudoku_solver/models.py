@@ -1,6 +1,48 @@
+from typing import TYPE_CHECKING, Any, Collection, Self, Sequence
+
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from .utils import board_utils
+
+if TYPE_CHECKING:
+    from .solving import GivensAnalysis
+
+
+class PackedBoardField(models.Field):
+    """Board stored packed (board_utils.pack_encoded), exposed as the comma separated encoding"""
+
+    _pyi_private_set_type: str
+    _pyi_private_get_type: str
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        kwargs.setdefault("max_length", board_utils.PACKED_BOARD_SIZE)
+        super().__init__(*args, **kwargs)
+
+    def get_internal_type(self) -> str:
+        return "BinaryField"
+
+    def from_db_value(self, value: bytes | memoryview | None, expression: Any, connection: Any) -> str | None:
+        return None if value is None else board_utils.unpack_encoded(bytes(value))
+
+    def to_python(self, value: Any) -> Any:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return board_utils.unpack_encoded(bytes(value))
+        return value
+
+    def get_prep_value(self, value: Any) -> Any:
+        value = super().get_prep_value(value)
+        if isinstance(value, str):
+            return board_utils.pack_encoded(value)
+        return value
+
+    def get_db_prep_value(self, value: Any, connection: Any, prepared: bool = False) -> Any:
+        value = super().get_db_prep_value(value, connection, prepared)
+        return None if value is None else connection.Database.Binary(value)
+
+    def value_to_string(self, obj: models.Model) -> str:
+        return str(self.value_from_object(obj))
+
 
 class User(AbstractUser):
     pass
@@ -8,13 +50,67 @@ class User(AbstractUser):
 
 class Board(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
-    board = models.CharField(max_length=323)
+    board = PackedBoardField()
     description = models.TextField(blank=True, null=True)
     created = models.DateTimeField(auto_now_add=True)
     changed = models.DateTimeField(auto_now=True, null=True)
+    # givens analysis, cleared on save when the givens change without a new one
+    solution = models.CharField(max_length=81, blank=True, default="", editable=False)
+    solution_count = models.PositiveSmallIntegerField(blank=True, null=True, editable=False)
+    givens_count = models.PositiveSmallIntegerField(blank=True, null=True, editable=False)
+    difficulty = models.PositiveSmallIntegerField(blank=True, null=True, editable=False)
+    canonical_digest = models.CharField(max_length=32, blank=True, null=True, editable=False)
+    # the analysis is of the loaded board givens, decoded only on save, or of the set_analysis givens
+    _analyzed_board: str | None = None
+    _analyzed_givens: tuple[int, ...] | None = None
 
     def __str__(self) -> str:
         return f"Board of {self.user.username} {self.description}. Created: {self.created}. Changed: {self.changed}"
 
+    @classmethod
+    def from_db(cls, db: str | None, field_names: Collection[str], values: Collection[Any], **kwargs: Any) -> Self:
+        instance = super().from_db(db, field_names, values, **kwargs)
+        if "board" in field_names:
+            instance._analyzed_board = instance.board
+        return instance
+
+    @property
+    def givens(self) -> tuple[int, ...]:
+        return board_utils.decode_givens(self.board)
+
+    @property
+    def stored_solution(self) -> tuple[int, ...] | None:
+        """Precomputed unique solution, None when it is unknown or the givens have several"""
+        if self.solution_count != 1 or not self.solution:
+            return None
+        return tuple(map(int, self.solution))
+
+    def set_analysis(self, givens: Sequence[int], analysis: "GivensAnalysis") -> None:
+        self.solution = analysis["solution"]
+        self.solution_count = analysis["solution_count"]
+        self.givens_count = analysis["givens_count"]
+        self.difficulty = analysis["difficulty"]
+        self.canonical_digest = analysis["canonical_digest"]
+        self._analyzed_board = None
+        self._analyzed_givens = tuple(givens)
+
+    def clear_analysis(self) -> None:
+        self.solution = ""
+        self.solution_count = self.givens_count = self.difficulty = self.canonical_digest = None
+        self._analyzed_board = self._analyzed_givens = None
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        if not self._is_analysis_current():
+            self.clear_analysis()
+        super().save(*args, **kwargs)
+
+    def _is_analysis_current(self) -> bool:
+        if self._analyzed_givens is not None:
+            return self._analyzed_givens == self.givens
+        if self._analyzed_board is None:
+            return False
+        return self._analyzed_board == self.board or board_utils.decode_givens(self._analyzed_board) == self.givens
+
     class Meta:
         ordering = ["-changed", "created"]
+        indexes = [models.Index(fields=["user", "canonical_digest"])]
@@ -0,0 +1,96 @@
+import threading
+from collections import OrderedDict
+from hashlib import blake2b
+from logging import getLogger
+from typing import Sequence
+
+from django.core.cache import caches
+
+from .utils.symmetry import SymmetryTransform
+
+
+class SolutionCache:
+    """Solutions keyed by a digest of the givens and the engine, an empty tuple marks givens without a solution.
+    A bounded in-process LRU tier keyed by the givens is in front of a Django cache shared by web server workers.
+    The shared tier is keyed by the canonical givens: symmetric puzzles share a solution.
+    Canonicalization is costly on nearly empty or symmetric givens: local misses are canonicalized,
+    looked up in the shared tier and solved by one solver pool task, the web process keeps its result with set.
+    Keys are content addressed, so changed givens never hit a stale solution.
+    Thread safe
+    """
+
+    VERSION = 2
+
+    def __init__(self, size: int, *, timeout: float | None = None, alias: str = "default"):
+        self._logger = getLogger(__name__)
+        self._size = size
+        self._timeout = timeout
+        self._alias = alias
+        self._local: OrderedDict[str, tuple[int, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._local_hits = 0
+        self._shared_hits = 0
+        self._misses = 0
+
+    def __str__(self) -> str:
+        return "SolutionCache"
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "local_hits": self._local_hits,
+            "shared_hits": self._shared_hits,
+            "misses": self._misses,
+            "size": len(self._local),
+        }
+
+    def get(self, givens: Sequence[int], engine: str) -> tuple[int, ...] | None:
+        """Local tier solution or None"""
+        key = self.make_key(givens, engine)
+        with self._lock:
+            value = self._local.get(key)
+            if value is not None:
+                self._local.move_to_end(key)
+                self._local_hits += 1
+            return value
+
+    def set(self, givens: Sequence[int], engine: str, solution: tuple[int, ...], *, shared_hit: bool = False) -> None:
+        """Keep the solution of a local miss in the local tier, counted as a shared tier hit or a miss"""
+        key = self.make_key(givens, engine)
+        with self._lock:
+            if shared_hit:
+                self._shared_hits += 1
+            else:
+                self._misses += 1
+            self._local[key] = solution
+            self._local.move_to_end(key)
+            if len(self._local) > self._size:
+                self._local.popitem(last=False)
+
+    def get_shared(
+        self, engine: str, canonical_givens: Sequence[int], transform: SymmetryTransform
+    ) -> tuple[int, ...] | None:
+        """Shared tier solution or None by the canonicalize results of the givens, in the givens orientation"""
+        key = self.make_key(canonical_givens, engine)
+        solution: tuple[int, ...] | None = caches[self._alias].get(key)
+        if solution is None:
+            return None
+        self._logger.debug("%s: Shared hit %s", self, key)
+        return transform.revert(solution) if solution else ()
+
+    def set_shared(
+        self, engine: str, solution: tuple[int, ...], canonical_givens: Sequence[int], transform: SymmetryTransform
+    ) -> None:
+        caches[self._alias].set(
+            self.make_key(canonical_givens, engine), transform.apply(solution) if solution else (), self._timeout
+        )
+
+    def clear(self) -> None:
+        """Clear the local tier and counters, the shared tier entries expire by timeout"""
+        with self._lock:
+            self._local.clear()
+            self._local_hits = self._shared_hits = self._misses = 0
+
+    @classmethod
+    def make_key(cls, givens: Sequence[int], engine: str) -> str:
+        return f"solution:{cls.VERSION}:{engine}:{blake2b(bytes(givens), digest_size=16).hexdigest()}"
@@ -1,11 +1,37 @@
 from ..sudoku import Cell as Cell
+from ..sudoku import ChangeJournal as ChangeJournal
 from ..sudoku import Container as Container
 from ..sudoku import Grid as Grid
 from ..sudoku import HistoryManager as HistoryManager
 from ..sudoku import as_complex_action as as_complex_action
+from ..sudoku import bitmask as bitmask
+from ..sudoku import topology as topology
+from . import profiling as profiling
+from .backtracking import BacktrackingSearch
 from .brute_forcer import BruteForcer
+from .dancing_links import DancingLinks
+from .difficulty import GUESSING_DIFFICULTY, GUESSING_TIER, Rating, get_difficulty_tier, rate, rate_difficulty
 from .exceptions import SolverException
+from .solutions import count_solutions, has_unique_solution
 from .solver import Solver
 from .step_solver import StepSolver
+from .strategy_scheduler import StrategyScheduler, StrategyStats
 
-__all__ = ["BruteForcer", "SolverException", "Solver", "StepSolver"]
+__all__ = [
+    "BacktrackingSearch",
+    "BruteForcer",
+    "DancingLinks",
+    "SolverException",
+    "Solver",
+    "StepSolver",
+    "StrategyScheduler",
+    "StrategyStats",
+    "GUESSING_DIFFICULTY",
+    "GUESSING_TIER",
+    "Rating",
+    "count_solutions",
+    "get_difficulty_tier",
+    "has_unique_solution",
+    "rate",
+    "rate_difficulty",
+]
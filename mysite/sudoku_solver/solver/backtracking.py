@@ -0,0 +1,125 @@
+from typing import Iterable
+
+from . import bitmask, topology
+
+# Trail entry: cell index << 13 | old candidates mask.
+# Only unsolved cells are trailed, rolling an entry back also clears the cell value
+_IDX_SHIFT = 13
+
+
+class BacktrackingSearch:
+    """Depth first search over plain candidates masks lists.
+    Naked and hidden singles are propagated to a fixpoint at every node.
+    Changes are recorded on a trail and rolled back on backtrack
+    """
+
+    def __init__(self, givens: Iterable[int]):
+        self._values = [0] * 81
+        self._masks = [bitmask.FULL_MASK] * 81
+        self._trail: list[int] = []
+        self._singles: list[int] = []
+        self._is_consistent = (
+            all(self._assign(idx, value) for idx, value in enumerate(givens) if value) and self._propagate()
+        )
+
+    def solutions(self, limit: int) -> list[list[int]]:
+        """Up to limit solutions as 81 cells values lists"""
+        result: list[list[int]] = []
+        if self._is_consistent and limit > 0:
+            self._search(result, limit)
+        return result
+
+    def _search(self, result: list[list[int]], limit: int) -> bool:
+        masks = self._masks
+        best = -1
+        best_count = 10
+        for idx in range(81):
+            mask = masks[idx]
+            if mask:
+                count = mask.bit_count()
+                if count < best_count:
+                    best, best_count = idx, count
+                    if count == 2:
+                        break
+        if best < 0:
+            result.append(self._values[:])
+            return len(result) >= limit
+        mark = len(self._trail)
+        for digit in bitmask.to_digits(masks[best]):
+            if self._assign(best, digit) and self._propagate() and self._search(result, limit):
+                return True
+            self._rollback(mark)
+        return False
+
+    def _assign(self, idx: int, digit: int) -> bool:
+        """Set cell value and remove digit from its peers. Found naked singles are queued"""
+        masks = self._masks
+        bit = 1 << (digit - 1)
+        mask = masks[idx]
+        if not mask & bit:
+            return False
+        trail = self._trail
+        trail.append(idx << _IDX_SHIFT | mask)
+        self._values[idx] = digit
+        masks[idx] = 0
+        for peer in topology.PEERS[idx]:
+            peer_mask = masks[peer]
+            if peer_mask & bit:
+                trail.append(peer << _IDX_SHIFT | peer_mask)
+                peer_mask ^= bit
+                masks[peer] = peer_mask
+                if not peer_mask:
+                    return False
+                if not peer_mask & (peer_mask - 1):
+                    self._singles.append(peer)
+        return True
+
+    def _propagate(self) -> bool:
+        masks = self._masks
+        singles = self._singles
+        while True:
+            while singles:
+                idx = singles.pop()
+                mask = masks[idx]
+                if mask and not self._assign(idx, mask.bit_length()):
+                    singles.clear()
+                    return False
+            match self._assign_hidden_singles():
+                case None:
+                    singles.clear()
+                    return False
+                case False:
+                    return True
+
+    def _assign_hidden_singles(self) -> bool | None:
+        """True if any hidden single was assigned, None on contradiction"""
+        values, masks = self._values, self._masks
+        assigned = False
+        for cells in topology.CONTAINER_CELLS:
+            once = twice = placed = 0
+            for idx in cells:
+                mask = masks[idx]
+                if mask:
+                    twice |= once & mask
+                    once |= mask
+                else:
+                    placed |= 1 << (values[idx] - 1)
+            if once | placed != bitmask.FULL_MASK:
+                return None
+            hidden = once & ~twice
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                idx = next((idx for idx in cells if masks[idx] & bit), -1)
+                if idx < 0 or not self._assign(idx, bit.bit_length()):
+                    return None
+                assigned = True
+        return assigned
+
+    def _rollback(self, mark: int) -> None:
+        trail, values, masks = self._trail, self._values, self._masks
+        while len(trail) > mark:
+            entry = trail.pop()
+            idx = entry >> _IDX_SHIFT
+            values[idx] = 0
+            masks[idx] = entry & bitmask.FULL_MASK
@@ -0,0 +1,189 @@
+from functools import cache
+from typing import Iterable
+
+from . import topology
+from .solver import Solver
+
+# Exact cover columns: cell has value, row has digit, column has digit, box has digit
+_COLUMNS_COUNT = 4 * 81
+# Exact cover rows: cell index * 9 + digit - 1
+_ROWS_COUNT = 9 * 81
+_ROOT = 0
+_FIRST_ROW_NODE = _COLUMNS_COUNT + 1
+
+
+class ExactCoverMatrix:
+    """Sudoku exact cover matrix in dancing links form.
+    Node 0 is the root, nodes 1-324 are columns headers, row r nodes are 4 consecutive nodes.
+    Links are built once, every search works on its own copy
+    """
+
+    def __init__(self) -> None:
+        nodes_count = _FIRST_ROW_NODE + 4 * _ROWS_COUNT
+        self.left = [0] * nodes_count
+        self.right = [0] * nodes_count
+        self.up = list(range(nodes_count))
+        self.down = list(range(nodes_count))
+        self.column = [0] * nodes_count
+        self.sizes = [0] * (_COLUMNS_COUNT + 1)
+        self._build()
+
+    def links(self) -> tuple[list[int], list[int], list[int], list[int], list[int]]:
+        return self.left[:], self.right[:], self.up[:], self.down[:], self.sizes[:]
+
+    @staticmethod
+    def row_node(idx: int, digit: int) -> int:
+        return _FIRST_ROW_NODE + 4 * (idx * 9 + digit - 1)
+
+    @staticmethod
+    def node_row(node: int) -> tuple[int, int]:
+        """Node -> (cell index, digit)"""
+        idx, digit = divmod((node - _FIRST_ROW_NODE) // 4, 9)
+        return idx, digit + 1
+
+    def _build(self) -> None:
+        headers = _COLUMNS_COUNT + 1
+        for header in range(headers):
+            self.left[header] = (header - 1) % headers
+            self.right[header] = (header + 1) % headers
+        for idx in range(81):
+            for digit in range(1, 10):
+                node = self.row_node(idx, digit)
+                offset = digit - 1
+                columns = (
+                    idx,
+                    81 + topology.ROW_OF[idx] * 9 + offset,
+                    162 + topology.COLUMN_OF[idx] * 9 + offset,
+                    243 + topology.BOX_OF[idx] * 9 + offset,
+                )
+                for i, column in enumerate(columns):
+                    self._append(node + i, column + 1)
+                    self.left[node + i] = node + (i - 1) % 4
+                    self.right[node + i] = node + (i + 1) % 4
+
+    def _append(self, node: int, header: int) -> None:
+        self.column[node] = header
+        self.up[node] = self.up[header]
+        self.down[node] = header
+        self.down[self.up[header]] = node
+        self.up[header] = node
+        self.sizes[header] += 1
+
+
+@cache
+def get_exact_cover_matrix() -> ExactCoverMatrix:
+    return ExactCoverMatrix()
+
+
+class ExactCoverSearch:
+    """Algorithm X search over a copy of the exact cover matrix links"""
+
+    def __init__(self, givens: Iterable[int]):
+        self._matrix = get_exact_cover_matrix()
+        self._left, self._right, self._up, self._down, self._sizes = self._matrix.links()
+        self._column = self._matrix.column
+        self._solution: list[int] = []
+        self._is_consistent = self._select_givens(givens)
+
+    def solutions(self, limit: int) -> list[list[int]]:
+        """Up to limit solutions as 81 cells values lists"""
+        result: list[list[int]] = []
+        if self._is_consistent and limit > 0:
+            self._search(result, limit)
+        return result
+
+    def _select_givens(self, givens: Iterable[int]) -> bool:
+        covered = bytearray(_COLUMNS_COUNT + 1)
+        for idx, value in enumerate(givens):
+            if not value:
+                continue
+            node = self._matrix.row_node(idx, value)
+            for i in range(4):
+                header = self._column[node + i]
+                if covered[header]:
+                    return False
+                covered[header] = 1
+                self._cover(header)
+            self._solution.append(node)
+        return True
+
+    def _search(self, result: list[list[int]], limit: int) -> bool:
+        right, down, sizes = self._right, self._down, self._sizes
+        if right[_ROOT] == _ROOT:
+            values = [0] * 81
+            for node in self._solution:
+                idx, digit = self._matrix.node_row(node)
+                values[idx] = digit
+            result.append(values)
+            return len(result) >= limit
+        # choose the column with the fewest rows
+        best = header = right[_ROOT]
+        while header != _ROOT and sizes[best]:
+            if sizes[header] < sizes[best]:
+                best = header
+            header = right[header]
+        if not sizes[best]:
+            return False
+        self._cover(best)
+        node = down[best]
+        done = False
+        while node != best and not done:
+            self._solution.append(node)
+            j = right[node]
+            while j != node:
+                self._cover(self._column[j])
+                j = right[j]
+            done = self._search(result, limit)
+            j = self._left[node]
+            while j != node:
+                self._uncover(self._column[j])
+                j = self._left[j]
+            self._solution.pop()
+            node = down[node]
+        self._uncover(best)
+        return done
+
+    def _cover(self, header: int) -> None:
+        left, right, up, down, sizes, column = self._left, self._right, self._up, self._down, self._sizes, self._column
+        right[left[header]] = right[header]
+        left[right[header]] = left[header]
+        i = down[header]
+        while i != header:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                sizes[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, header: int) -> None:
+        left, right, up, down, sizes, column = self._left, self._right, self._up, self._down, self._sizes, self._column
+        i = up[header]
+        while i != header:
+            j = left[i]
+            while j != i:
+                sizes[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[header]] = header
+        left[right[header]] = header
+
+
+class DancingLinks(Solver):
+    """Knuth's Algorithm X with dancing links. Solves the grid givens, non given cells are overwritten"""
+
+    def __str__(self) -> str:
+        return "Dancing links"
+
+    def _solve(self) -> bool:
+        solutions = ExactCoverSearch(self._grid.state.givens).solutions(1)
+        if not solutions:
+            self._logger.warning("%s: %s has no solution", self, self._grid)
+            return False
+        for cell, value in zip(self._grid.cells, solutions[0]):
+            if not cell.is_given:
+                cell.value = value
+        return True
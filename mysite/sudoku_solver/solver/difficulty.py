@@ -0,0 +1,70 @@
+from . import Grid
+from .step_solver import StepSolver
+
+# StepSolver strategies count + 1: the grid can't be solved by strategies alone
+GUESSING_DIFFICULTY = 18
+GUESSING_TIER = "guessing"
+# Highest difficulty of each tier: singles, subsets and intersections, basic fish and short chains, the rest
+DIFFICULTY_TIERS = ((2, "easy"), (10, "medium"), (14, "hard"), (17, "expert"))
+# Difficulty weight in the score, above any steps count
+_STEPS_LIMIT = 1000
+
+
+class Rating:
+    """StepSolver rating of grid givens.
+    difficulty: rank of the hardest strategy needed, GUESSING_DIFFICULTY when the strategies get stuck
+    strategy: name of the hardest strategy needed, None when the strategies get stuck
+    steps: steps made until solved or stuck
+    score: difficulty then steps count, comparable between ratings
+    """
+
+    __slots__ = ("difficulty", "steps", "strategy")
+
+    def __init__(self, difficulty: int, strategy: str | None, steps: int):
+        self.difficulty = difficulty
+        self.strategy = strategy
+        self.steps = steps
+
+    def __repr__(self) -> str:
+        return f"Rating({self.difficulty}, {self.strategy!r}, {self.steps})"
+
+    @property
+    def tier(self) -> str:
+        return get_difficulty_tier(self.difficulty)
+
+    @property
+    def score(self) -> int:
+        return self.difficulty * _STEPS_LIMIT + min(self.steps, _STEPS_LIMIT - 1)
+
+
+def rate(grid: Grid) -> Rating:
+    """Solve the grid givens with StepSolver, from the simplest strategy at each step"""
+    grid = Grid(grid.state.givens)
+    grid.init_candidates()
+    solver = StepSolver(grid)
+    ranks = {id(strategy): rank for rank, strategy in enumerate(solver.strategies, 1)}
+    difficulty = 1
+    strategy: str | None = str(solver.strategies[0])
+    steps = 0
+    while not grid.is_solved:
+        if not solver.solve() or solver.last_strategy is None:
+            return Rating(GUESSING_DIFFICULTY, None, steps)
+        steps += 1
+        rank = ranks[id(solver.last_strategy)]
+        if rank > difficulty:
+            difficulty, strategy = rank, str(solver.last_strategy)
+    return Rating(difficulty, strategy, steps)
+
+
+def rate_difficulty(grid: Grid) -> int:
+    """Rank of the hardest StepSolver strategy needed to solve the grid givens, 1 when naked singles are enough.
+    GUESSING_DIFFICULTY when the strategies get stuck
+    """
+    return rate(grid).difficulty
+
+
+def get_difficulty_tier(difficulty: int) -> str:
+    for max_difficulty, tier in DIFFICULTY_TIERS:
+        if difficulty <= max_difficulty:
+            return tier
+    return GUESSING_TIER
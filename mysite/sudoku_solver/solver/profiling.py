@@ -0,0 +1,112 @@
+"""Opt-in per-process solvers and strategies profiling.
+Disabled, instrumented calls only check a module flag. Profiles are kept per process:
+solver pool workers profile their own calls
+"""
+
+import threading
+from bisect import bisect_left
+from typing import TypedDict
+
+SOLVERS = "solvers"
+STRATEGIES = "strategies"
+# Per call time histogram buckets upper bounds, seconds. The last bucket counts slower calls
+HISTOGRAM_BOUNDS = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+
+_enabled = False
+_profiles: dict[str, dict[str, "Profile"]] = {SOLVERS: {}, STRATEGIES: {}}
+# Guards the profiles: solvers may run in several threads of a process
+_profiles_lock = threading.Lock()
+
+
+class ProfileData(TypedDict):
+    calls: int
+    hits: int
+    seconds: float
+    max_seconds: float
+    scanned: int  # containers or digits scanned, strategies only
+    histogram: list[int]  # calls by HISTOGRAM_BOUNDS bucket, slower calls last
+
+
+class Profile:
+    __slots__ = ("calls", "histogram", "hits", "max_seconds", "scanned", "seconds")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.hits = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.scanned = 0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+
+    def record(self, seconds: float, hit: bool, scanned: int) -> None:
+        self.calls += 1
+        self.hits += hit
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.scanned += scanned
+        self.histogram[bisect_left(HISTOGRAM_BOUNDS, seconds)] += 1
+
+    def to_data(self) -> ProfileData:
+        return {
+            "calls": self.calls,
+            "hits": self.hits,
+            "seconds": self.seconds,
+            "max_seconds": self.max_seconds,
+            "scanned": self.scanned,
+            "histogram": self.histogram[:],
+        }
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = enabled
+
+
+def record(kind: str, name: str, seconds: float, hit: bool, scanned: int = 0) -> None:
+    profiles = _profiles[kind]
+    with _profiles_lock:
+        profile = profiles.get(name)
+        if profile is None:
+            profile = profiles[name] = Profile()
+        profile.record(seconds, hit, scanned)
+
+
+def get_profiles() -> dict[str, dict[str, ProfileData]]:
+    """Process profiles by kind (SOLVERS, STRATEGIES) and name"""
+    with _profiles_lock:
+        return {
+            kind: {name: profile.to_data() for name, profile in profiles.items()}
+            for kind, profiles in _profiles.items()
+        }
+
+
+def reset() -> None:
+    with _profiles_lock:
+        for profiles in _profiles.values():
+            profiles.clear()
+
+
+def merge_profiles(
+    profiles: list[dict[str, dict[str, ProfileData]]],
+) -> dict[str, dict[str, ProfileData]]:
+    """Sum of several processes profiles"""
+    result: dict[str, dict[str, ProfileData]] = {SOLVERS: {}, STRATEGIES: {}}
+    for process_profiles in profiles:
+        for kind, kind_profiles in process_profiles.items():
+            merged = result.setdefault(kind, {})
+            for name, data in kind_profiles.items():
+                if name not in merged:
+                    merged[name] = {**data, "histogram": data["histogram"][:]}
+                    continue
+                total = merged[name]
+                total["calls"] += data["calls"]
+                total["hits"] += data["hits"]
+                total["seconds"] += data["seconds"]
+                total["max_seconds"] = max(total["max_seconds"], data["max_seconds"])
+                total["scanned"] += data["scanned"]
+                total["histogram"] = [a + b for a, b in zip(total["histogram"], data["histogram"])]
+    return result
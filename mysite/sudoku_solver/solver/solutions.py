@@ -0,0 +1,11 @@
+from . import Grid
+from .backtracking import BacktrackingSearch
+
+
+def count_solutions(grid: Grid, limit: int = 2) -> int:
+    """Grid givens solutions count. The search stops as soon as limit solutions are found"""
+    return len(BacktrackingSearch(grid.state.givens).solutions(limit))
+
+
+def has_unique_solution(grid: Grid) -> bool:
+    return count_solutions(grid, limit=2) == 1
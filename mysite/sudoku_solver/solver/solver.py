@@ -1,7 +1,8 @@
+import time
 from abc import ABC, abstractmethod
 from logging import getLogger
 
-from . import Grid, HistoryManager, as_complex_action
+from . import ChangeJournal, Grid, HistoryManager, as_complex_action, profiling
 from .exceptions import SolverException
 from .strategies import StrategyException
 
@@ -18,13 +19,20 @@ class Solver(ABC):
     def history_manager(self) -> HistoryManager:
         return self._grid.history_manager
 
+    @property
+    def journal(self) -> ChangeJournal:
+        return self._grid.journal
+
     @as_complex_action
     def solve(self) -> bool:
         self._logger.info("%s: Solving ...", self)
+        started = time.perf_counter() if profiling.is_enabled() else None
         try:
             res = self._solve()
         except StrategyException as e:
             raise SolverException("asd", e)
+        if started is not None:
+            profiling.record(profiling.SOLVERS, str(self), time.perf_counter() - started, res)
         if res:
             self._logger.info("%s: Solved", self)
         else:
@@ -13,10 +13,17 @@ from .strategies import (
     XYZWing,
     YWing,
 )
+from .strategies.strategy import Strategy
+from .strategy_scheduler import StrategyScheduler
 
 
 class StepSolver(Solver):
-    def __init__(self, grid: Grid):
+    """Applies one strategy making progress per solve: the simplest one when strict,
+    otherwise the first one found in the scheduler adaptive order (see StrategyScheduler).
+    Strategies keep which regions gave no result and skip them while unchanged, unless track_changes is off
+    """
+
+    def __init__(self, grid: Grid, *, strict: bool = True, track_changes: bool = True):
         super().__init__(grid)
         self._solvers = [
             NakedSingle(self._grid),
@@ -37,11 +44,30 @@ class StepSolver(Solver):
             XYZWing(self._grid),
             XChain(self._grid),
         ]
+        for solver in self._solvers:
+            solver.track_changes = track_changes
+        self._scheduler = StrategyScheduler(self._solvers, strict=strict)
+        self._last_strategy: Strategy | None = None
 
     def __str__(self) -> str:
         return "Step solver"
 
+    @property
+    def strategies(self) -> tuple[Strategy, ...]:
+        """Strategies by difficulty, from the simplest"""
+        return tuple(self._solvers)
+
+    @property
+    def scheduler(self) -> StrategyScheduler:
+        return self._scheduler
+
+    @property
+    def last_strategy(self) -> Strategy | None:
+        """Strategy that made the last step, None when the last solve made no progress"""
+        return self._last_strategy
+
     def _solve(self) -> bool:
+        self._last_strategy = None
         if not self._grid.is_consistent:
             self._logger.warning("%s: %s is inconsistent", self, self._grid)
             return False
@@ -51,4 +77,5 @@ class StepSolver(Solver):
         if self._grid.is_solved:
             self._logger.warning("%s: %s is already solved", self, self._grid)
             return False
-        return any(solver.solve() for solver in self._solvers)
+        self._last_strategy = self._scheduler.run()
+        return self._last_strategy is not None
@@ -16,5 +16,18 @@ class BasicStrategy(Strategy):
     @abstractmethod
     def _solve_container(self, container: Container) -> bool: ...
 
-    def solve(self) -> bool:
-        return any(self._solve_container(cont) for cont in self._get_base_containers())
+    def _solve(self) -> bool:
+        for cont in self._get_base_containers():
+            version = self._get_container_version(cont)
+            if self._is_scanned(cont.grid_idx, version):
+                continue
+            self.scanned += 1
+            if self._solve_container(cont):
+                self.base_containers = (cont.grid_idx,)
+                return True
+            self._set_scanned(cont.grid_idx, version)
+        return False
+
+    def _get_container_version(self, container: Container) -> int:
+        """Version of the cells the container result depends on"""
+        return self._grid.state.container_versions[container.grid_idx]
@@ -1,7 +1,6 @@
-from itertools import chain
 from typing import Iterable
 
-from ... import Cell, Container
+from ... import Container, bitmask
 from .basic_strategy import BasicStrategy
 
 
@@ -12,19 +11,16 @@ class HiddenSingle(BasicStrategy):
         return "Hidden single"
 
     def _get_base_containers(self) -> Iterable[Container]:
-        return chain(self._grid.rows, self._grid.columns, self._grid.boxes)
+        return self._grid.containers
 
     def _solve_container(self, container: Container) -> bool:
         for cand in range(1, 10):
-            cell: Cell | None = None
-            for cont_cell in container.filter_cells(has_candidate=cand):
-                if cell:
-                    cell = None
-                    break
-                cell = cont_cell
-            if not cell:
+            positions = self._grid.get_candidate_positions(container, cand)
+            if bitmask.popcount(positions) != 1:
                 continue
+            cell = container.cells[positions.bit_length() - 1]
             self._logger.info("%s: %s = %d. Base: %s", self, cell, cand, container)
+            self._set_base(cells=(cell,))
             self._grid.set_value(cell, cand)
             return True
         return False
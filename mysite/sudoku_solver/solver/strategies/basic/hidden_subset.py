@@ -1,7 +1,7 @@
-from itertools import chain, combinations
+from itertools import combinations
 from typing import Iterable
 
-from ... import Container, Grid
+from ... import Container, Grid, bitmask
 from ..exceptions import StrategyException
 from .basic_strategy import BasicStrategy
 
@@ -19,7 +19,7 @@ class HiddenSubset(BasicStrategy):
         return f"Hidden {self._SUBSET_NAME.get(self._subset_length, 'SUBSET')}"
 
     def _get_base_containers(self) -> Iterable[Container]:
-        for cont in chain(self._grid.rows, self._grid.columns, self._grid.boxes):
+        for cont in self._grid.containers:
             if len(tuple(cont.filter_cells(solved=False))) > self._subset_length:
                 yield cont
 
@@ -31,12 +31,14 @@ class HiddenSubset(BasicStrategy):
             # Main rule: N candidates appers only in N cells
             if len(cells) != self._subset_length:
                 continue
+            cands_mask = bitmask.to_mask(cands)
             # Subset cells with additional candidates
-            affected_cells = [cell for cell in cells if cell.candidates - set(cands)]
+            affected_cells = [cell for cell in cells if cell.candidates_mask & ~cands_mask]
             if not affected_cells:
                 continue
             self._logger.info("%s: %s. Base: %s %s. Affected: %s", self, cands, container, cells, affected_cells)
+            self._set_base(cells=cells)
             for cell in affected_cells:
-                cell.candidates &= set(cands)
+                cell.candidates_mask &= cands_mask
             return True
         return False
@@ -1,7 +1,7 @@
 from itertools import chain
 from typing import Iterable
 
-from .... import Cell, Container
+from .... import Cell, Container, topology
 from .intersection_strategy import IntersectionStrategy
 
 
@@ -17,5 +17,5 @@ class BoxLineReduction(IntersectionStrategy):
                 yield cont
 
     def _get_affected_container(self, cells: tuple[Cell, ...]) -> Container | None:
-        boxes = {self._grid.get_box(cell) for cell in cells}
-        return boxes.pop() if len(boxes) == 1 else None
+        boxes = {topology.BOX_OF[cell.idx] for cell in cells}
+        return self._grid.boxes[boxes.pop()] if len(boxes) == 1 else None
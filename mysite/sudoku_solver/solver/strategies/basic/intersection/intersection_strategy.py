@@ -1,6 +1,6 @@
 from abc import abstractmethod
 
-from .... import Cell, Container
+from .... import Cell, Container, topology
 from ..basic_strategy import BasicStrategy
 
 
@@ -8,14 +8,21 @@ class IntersectionStrategy(BasicStrategy):
     @abstractmethod
     def _get_affected_container(self, cells: tuple[Cell, ...]) -> Container | None: ...
 
+    def _get_container_version(self, container: Container) -> int:
+        # Versions only grow, so their sum changes with any of the crossing containers
+        versions = self._grid.state.container_versions
+        idx = container.grid_idx
+        return versions[idx] + sum(versions[cont] for cont in topology.CROSSING_CONTAINERS[idx])
+
     def _solve_container(self, container: Container) -> bool:
         for cand, cells in self._get_candidate_cells_map(container, min_cells=2, max_cells=3).items():
             affected_cont = self._get_affected_container(cells)
             if not affected_cont:
                 continue
-            affected_cells = set(affected_cont.filter_cells(has_candidate=cand)) - set(
-                container.filter_cells(solved=False)
-            )
+            intersection = topology.INTERSECTIONS[(container.grid_idx, affected_cont.grid_idx)]
+            affected_cells = {
+                cell for cell in self._grid.get_candidate_cells(cand, affected_cont) if cell.idx not in intersection
+            }
             if not affected_cells:
                 continue
             self._logger.info(
@@ -28,7 +35,8 @@ class IntersectionStrategy(BasicStrategy):
                 affected_cont,
                 affected_cells,
             )
+            self._set_base(cells=cells)
             for cell in affected_cells:
-                cell.candidates -= {cand}
+                cell.remove_candidate(cand)
             return True
         return False
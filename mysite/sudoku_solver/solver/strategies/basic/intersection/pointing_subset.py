@@ -1,6 +1,6 @@
 from typing import Iterable
 
-from .... import Cell, Container
+from .... import Cell, Container, topology
 from .intersection_strategy import IntersectionStrategy
 
 
@@ -18,10 +18,10 @@ class PointingSubset(IntersectionStrategy):
                 yield cont
 
     def _get_affected_container(self, cells: tuple[Cell, ...]) -> Container | None:
-        rows = {self._grid.get_row(cell) for cell in cells}
+        rows = {topology.ROW_OF[cell.idx] for cell in cells}
         if len(rows) == 1:
-            return rows.pop()
-        columns = {self._grid.get_column(cell) for cell in cells}
+            return self._grid.rows[rows.pop()]
+        columns = {topology.COLUMN_OF[cell.idx] for cell in cells}
         if len(columns) == 1:
-            return columns.pop()
+            return self._grid.columns[columns.pop()]
         return None
@@ -15,10 +15,11 @@ class NakedSingle(BasicStrategy):
 
     def _solve_container(self, container: Container) -> bool:
         for cell in container.cells:
-            if len(cell.candidates) != 1:
+            if cell.candidates_count != 1:
                 continue
-            value = next(iter(cell.candidates))
+            value = cell.candidates_mask.bit_length()
             self._logger.info("%s: %s = %d", self, cell, value)
+            self._set_base(cells=(cell,))
             self._grid.set_value(cell, value)
             return True
         return False
@@ -1,7 +1,7 @@
-from itertools import chain, combinations
+from itertools import combinations
 from typing import Iterable
 
-from ... import Container, Grid
+from ... import Container, Grid, bitmask
 from ..exceptions import StrategyException
 from .basic_strategy import BasicStrategy
 
@@ -19,7 +19,7 @@ class NakedSubset(BasicStrategy):
         return f"Naked {self._SUBSET_NAME.get(self._subset_length, 'SUBSET')}"
 
     def _get_base_containers(self) -> Iterable[Container]:
-        for cont in chain(self._grid.rows, self._grid.columns, self._grid.boxes):
+        for cont in self._grid.containers:
             if len(tuple(cont.filter_cells(solved=False))) > self._subset_length:
                 yield cont
 
@@ -28,8 +28,9 @@ class NakedSubset(BasicStrategy):
         for cands in combinations(cand_cells_map, self._subset_length):
             # Cells that have at least one combination candidate
             cells = {cell for cand in cands for cell in cand_cells_map[cand]}
+            cands_mask = bitmask.to_mask(cands)
             # Cells that have only subset candidates
-            naked_subset_cells = [cell for cell in cells if not cell.candidates - set(cands)]
+            naked_subset_cells = [cell for cell in cells if not cell.candidates_mask & ~cands_mask]
             # Main rule: N cells share same N candidates
             if len(naked_subset_cells) != self._subset_length:
                 continue
@@ -40,7 +41,8 @@ class NakedSubset(BasicStrategy):
             self._logger.info(
                 "%s: %s. Base: %s %s. Affected: %s", self, cands, container, naked_subset_cells, affected_cells
             )
+            self._set_base(cells=naked_subset_cells)
             for cell in affected_cells:
-                cell.candidates -= set(cands)
+                cell.candidates_mask &= ~cands_mask
             return True
         return False
@@ -2,7 +2,7 @@ import logging
 from itertools import combinations
 from typing import Iterable
 
-from ... import Cell, Container, Grid
+from ... import Cell, Container, Grid, bitmask, topology
 from ..exceptions import StrategyException
 from .multi_containers_strategy import MultiContainersStrategy
 
@@ -29,6 +29,9 @@ class BasicFish(MultiContainersStrategy):
             raise StrategyException(f"{self}: unexpected subset length {self._subset_length}")
         self._ROWS_GROUP = "rows"
         self._COLUMNS_GROUP = "cols"
+        self._line_combinations = topology.LINE_COMBINATIONS.get(self._subset_length) or tuple(
+            combinations(range(9), self._subset_length)
+        )
 
     def __str__(self) -> str:
         BASIC_FISHES = {2: "X-Wing", 3: "Swordfish", 4: "Jelyfish", 5: "Squirmbag", 6: "Whale", 7: "Leviathan"}
@@ -38,20 +41,33 @@ class BasicFish(MultiContainersStrategy):
         return ((self._ROWS_GROUP, self._grid.rows), (self._COLUMNS_GROUP, self._grid.columns))
 
     def _solve_cell_subsets(self, containers_type: str, candidate: int, cells_subsets: list[set[Cell]]) -> bool:
-        for cells_subsets_combination in combinations(cells_subsets, self._subset_length):
-            cells = [cell for cells_subset in cells_subsets_combination for cell in cells_subset]
-            affected_conts = self._get_affected_containers(cells, containers_type)
-            if not affected_conts:
+        base_lines, cover_lines = self._get_lines_topology(containers_type)
+        # Base line index -> bitmask of cover lines holding the candidate (base line positions)
+        covers: dict[int, int] = {}
+        for line, cont in enumerate(base_lines):
+            positions = self._grid.get_candidate_positions(cont, candidate)
+            if 2 <= bitmask.popcount(positions) <= self._subset_length:
+                covers[line] = positions
+        for lines in self._line_combinations:
+            if any(line not in covers for line in lines):
                 continue
+            cover_mask = 0
+            lines_mask = 0
+            for line in lines:
+                cover_mask |= covers[line]
+                lines_mask |= 1 << line
+            if bitmask.popcount(cover_mask) != self._subset_length:
+                continue
+            affected_conts = {cover_lines[i] for i in bitmask.to_positions(cover_mask)}
             affected_cells = [
-                cell
+                cont.cells[pos]
                 for cont in affected_conts
-                for cell in cont.filter_cells(has_candidate=candidate)
-                if cell not in cells
+                for pos in bitmask.to_positions(self._grid.get_candidate_positions(cont, candidate) & ~lines_mask)
             ]
             if not affected_cells:
                 continue
-            base_conts = self._get_base_containers(cells, containers_type)
+            base_conts = {base_lines[line] for line in lines}
+            cells = [cell for cont in base_conts for cell in self._grid.get_candidate_cells(candidate, cont)]
             self._logger.info(
                 "%s: %d. Base: %s %s %s. Affected: %s",
                 self,
@@ -66,29 +82,18 @@ class BasicFish(MultiContainersStrategy):
                     self._logger.debug(
                         f"{self}: {cont}: {[(cell, cell.candidates) for cell in cont.filter_cells(solved=False)]}"
                     )
+            self._set_base(containers=base_conts, cells=cells)
             for cell in affected_cells:
-                cell.candidates -= {candidate}
+                cell.remove_candidate(candidate)
             return True
         return False
 
-    def _get_base_containers(self, subsets_cells: Iterable[Cell], conts_group_type: str) -> set[Container]:
+    def _get_lines_topology(self, conts_group_type: str) -> tuple[tuple[Container, ...], tuple[Container, ...]]:
+        """Base lines, cover lines. Base line positions are cover lines indexes and vice versa"""
         match conts_group_type:
             case self._ROWS_GROUP:
-                result = {self._grid.get_row(cell) for cell in subsets_cells}
+                return self._grid.rows, self._grid.columns
             case self._COLUMNS_GROUP:
-                result = {self._grid.get_column(cell) for cell in subsets_cells}
+                return self._grid.columns, self._grid.rows
             case _:
                 raise StrategyException(f"{self}: Unexpected base containsers group type {conts_group_type}")
-        if len(result) != self._subset_length:
-            raise StrategyException(f"{self}: Internal error")
-        return result
-
-    def _get_affected_containers(self, subsets_cells: Iterable[Cell], conts_group_type: str) -> set[Container]:
-        match conts_group_type:
-            case self._ROWS_GROUP:
-                result = {self._grid.get_column(cell) for cell in subsets_cells}
-            case self._COLUMNS_GROUP:
-                result = {self._grid.get_row(cell) for cell in subsets_cells}
-            case _:
-                raise StrategyException(f"{self}: Unexpected affected containsers group type {conts_group_type}")
-        return result if len(result) == self._subset_length else set()
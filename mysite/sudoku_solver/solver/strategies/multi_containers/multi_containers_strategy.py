@@ -19,18 +19,30 @@ class MultiContainersStrategy(Strategy):
     @abstractmethod
     def _solve_cell_subsets(self, containers_type: str, candidate: int, cells_subsets: list[set[Cell]]) -> bool: ...
 
-    def solve(self) -> bool:
+    def _solve(self) -> bool:
+        # Results depend on a single digit candidates only
+        versions = self._grid.state.digit_versions
+        cands = [cand for cand in range(1, 10) if not self._is_scanned(cand, versions[cand - 1])]
+        if not cands:
+            return False
         for conts_type, conts in self._get_containers_subsets():
-            cand_subsets_map = self._get_cand_subsets_map(conts)
+            cand_subsets_map = self._get_cand_subsets_map(conts, cands)
             for cand, subsets in cand_subsets_map.items():
                 if self._solve_cell_subsets(conts_type, cand, subsets):
                     return True
+        for cand in cands:
+            self._set_scanned(cand, versions[cand - 1])
         return False
 
-    def _get_cand_subsets_map(self, containers: Iterable[Container]) -> dict[int, list[set[Cell]]]:
+    def _get_cand_subsets_map(
+        self, containers: Iterable[Container], candidates: Iterable[int] = range(1, 10)
+    ) -> dict[int, list[set[Cell]]]:
         result: dict[int, list[set[Cell]]] = {}
         for cont in containers:
-            cand_cells_map = self._get_candidate_cells_map(cont, min_cells=2, max_cells=self._subset_length)
+            self.scanned += 1
+            cand_cells_map = self._get_candidate_cells_map(
+                cont, min_cells=2, max_cells=self._subset_length, candidates=candidates
+            )
             for cand, cells in cand_cells_map.items():
                 if cand not in result:
                     result[cand] = []
@@ -1,16 +1,21 @@
-import itertools
-from typing import Collection, Iterable, Sequence
+from typing import Iterable, Iterator
 
-from ... import Cell, Container, Grid
-from ..exceptions import StrategyException
+from ... import Cell, Container, Grid, topology
 from .multi_containers_strategy import MultiContainersStrategy
 
+# Links in the shortest chain: strong, weak, strong. Shorter chains are conjugate pairs
+_MIN_CHAIN_LINKS = 3
+
 
 class XChain(MultiContainersStrategy):
     """Single-digit solving technique which uses a chain
     consisting of links that alternate between strong links and weak links,
     with the starting and ending link being strong.
     The target digit can be eliminated from any cell that is seen by both ends of the X-Chain.
+
+    Chains are searched in a per digit link graph with 81 bit cells masks adjacency:
+    breadth first from each start cell, alternating "off" (after a weak link) and "on" (after a strong link)
+    cells. An "on" cell and the start can't be both off, the first one with eliminations makes the step
     """
 
     def __init__(self, grid: Grid):
@@ -20,76 +25,86 @@ class XChain(MultiContainersStrategy):
         return "X-Chain"
 
     def _get_containers_subsets(self) -> Iterable[tuple[str, Iterable[Container]]]:
-        return (("all", itertools.chain(self._grid.rows, self._grid.columns, self._grid.boxes)),)
+        return (("all", self._grid.containers),)
 
     def _solve_cell_subsets(self, containers_type: str, candidate: int, cells_subsets: list[set[Cell]]) -> bool:
-        for chain in self._build_x_chains(cells_subsets):
-            cells = self._get_affected_cells(candidate, chain)
-            if not cells:
+        strong_links = self._get_strong_links(cells_subsets)
+        nodes = sum(1 << idx for idx in strong_links)
+        cands_mask = sum(1 << cell.idx for cell in self._grid.get_candidate_cells(candidate))
+        for start in sorted(strong_links):
+            found = self._find_chain(start, strong_links, nodes, cands_mask)
+            if found is None:
                 continue
+            chain_idxs, affected_mask = found
+            cells = [self._grid.cells[idx] for idx in _iter_bits(affected_mask)]
+            chain = tuple(self._grid.cells[idx] for idx in chain_idxs)
             self._logger.info("%s: %d. Affected cells: %s", self, candidate, cells)
             self._logger.debug("%s: Chain: %s", self, chain)
+            self._set_base(cells=chain)
             for cell in cells:
-                cell.candidates -= {candidate}
+                cell.remove_candidate(candidate)
             return True
         return False
 
-    def _build_x_chains(self, cells_pairs: Collection[set[Cell]]) -> list[tuple[Cell, ...]]:
-        result: list[tuple[Cell, ...]] = []
-        cells = {cell for cells in cells_pairs for cell in cells}
-        for cell in cells:
-            result += self._build_chains(cells_pairs, cells - {cell}, (cell,), True)
-        return self._adjust_chains(result)
-
-    def _build_chains(
-        self, cells_pairs: Collection[set[Cell]], cells: set[Cell], r: tuple[Cell, ...], link: bool
-    ) -> list[tuple[Cell, ...]]:
-        if not r:
-            raise StrategyException(f"{self}: Build chain internal error")
-        result: list[tuple[Cell, ...]] = []
-        links = self._find_links(r[-1], cells, cells_pairs, link)
-        for cell in links:
-            result += self._build_chains(cells_pairs, cells - {cell}, r + (cell,), not link)
-        if not links and len(r) > 3:  # chain with length < 3 is senseless
-            result.append(r if not (len(r) % 2) else r[:-1])  # remove weak link from chain end
+    @staticmethod
+    def _get_strong_links(cells_pairs: Iterable[set[Cell]]) -> dict[int, int]:
+        """Cell index -> cells mask of its conjugates"""
+        result: dict[int, int] = {}
+        for cell1, cell2 in cells_pairs:
+            result[cell1.idx] = result.get(cell1.idx, 0) | 1 << cell2.idx
+            result[cell2.idx] = result.get(cell2.idx, 0) | 1 << cell1.idx
         return result
 
-    def _find_links(self, cell: Cell, cells: set[Cell], cells_pairs: Collection[set[Cell]], link: bool) -> list[Cell]:
-        if link:
-            return [c for c in cells if {c, cell} in cells_pairs]
-        neighbors = self._grid.get_neighbors(cell, solved=False) & cells
-        return [neighbor for neighbor in neighbors if {neighbor, cell} not in cells_pairs]
-
-    def _adjust_chains(self, chains: Iterable[tuple[Cell, ...]]) -> list[tuple[Cell, ...]]:
-        result: list[tuple[Cell, ...]] = []
-        for seq in sorted(chains, key=len, reverse=True):
-            if self._is_subchain(seq, result) or self._is_subchain(tuple(reversed(seq)), result):
-                continue
-            result.append(seq)
-        return result
+    def _find_chain(
+        self, start: int, strong_links: dict[int, int], nodes: int, cands_mask: int
+    ) -> tuple[list[int], int] | None:
+        """Shortest chains from start over the nodes (strong links cells), level by level.
+        The first chain with eliminations: its cells indexes and the affected cells mask
+        """
+        peers = topology.PEER_MASKS
+        start_peers_cands = peers[start] & cands_mask
+        # cell index -> previous chain cell, of off and on cells. The start is off, it can't be "on" by itself
+        off_parents = {start: start}
+        on_parents: dict[int, int] = {}
+        visited_off = visited_on = 1 << start
+        frontier = [start]
+        links = 0
+        while frontier:
+            on_frontier: list[int] = []
+            for idx in frontier:
+                reached = strong_links[idx] & ~visited_on
+                visited_on |= reached
+                for on_idx in _iter_bits(reached):
+                    on_parents[on_idx] = idx
+                    on_frontier.append(on_idx)
+            links += 1
+            if links >= _MIN_CHAIN_LINKS:
+                for on_idx in on_frontier:
+                    if affected_mask := start_peers_cands & peers[on_idx]:
+                        return self._get_chain(on_idx, off_parents, on_parents), affected_mask
+            frontier = []
+            for idx in on_frontier:
+                reached = peers[idx] & nodes & ~strong_links[idx] & ~visited_off
+                visited_off |= reached
+                for off_idx in _iter_bits(reached):
+                    off_parents[off_idx] = idx
+                    frontier.append(off_idx)
+            links += 1
+        return None
 
-    def _is_subchain(self, chain: tuple[Cell, ...], chains: Iterable[tuple[Cell, ...]]) -> bool:
-        for base_chain in chains:
-            if any(base_chain[i : i + len(chain)] == chain for i in range(len(base_chain) - len(chain) + 1)):
-                return True
-        return False
+    @staticmethod
+    def _get_chain(end: int, off_parents: dict[int, int], on_parents: dict[int, int]) -> list[int]:
+        """Chain cells indexes from the start to the "on" end cell"""
+        chain = [end]
+        parents, other_parents = on_parents, off_parents
+        while (parent := parents[chain[-1]]) != chain[-1]:
+            chain.append(parent)
+            parents, other_parents = other_parents, parents
+        return chain[::-1]
 
-    def _get_affected_cells(self, candidate: int, chain: Sequence[Cell]) -> list[Cell]:
-        return [
-            cell for cell in self._grid.filter_cells(has_candidate=candidate) if self._is_affected_cell(cell, chain)
-        ]
 
-    def _is_affected_cell(self, cell: Cell, chain: Sequence[Cell]) -> bool:
-        """Affected cell can see chain/subchain(min length 4 cells) endpoints that start and end with a strong link
-        Chain: EVEN_IDX_cell<=>next_cell - strong link, ODD_IDX_cell<->next_cell - weak link
-        """
-        if cell in chain:
-            return False
-        endpoints = self._grid.get_neighbors(cell, solved=False) & set(chain)
-        idxs = [chain.index(cell) for cell in endpoints]
-        try:
-            max_odd = max(filter(lambda idx: idx % 2, idxs))
-            min_even = min(filter(lambda idx: not idx % 2, idxs))
-        except ValueError:
-            return False
-        return max_odd - min_even > 2
+def _iter_bits(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
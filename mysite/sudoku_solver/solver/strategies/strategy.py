@@ -1,27 +1,64 @@
+import time
 from abc import ABC, abstractmethod
 from logging import getLogger
 from typing import Iterable
 
-from .. import Cell, Container, Grid
+from .. import Cell, Container, Grid, bitmask, profiling
 
 
 class Strategy(ABC):
     def __init__(self, grid: Grid):
         self._grid = grid
         self._logger = getLogger(__name__)
+        # Skip regions (containers or digits) unchanged since they were scanned without result
+        self.track_changes = True
+        self.skipped = 0
+        # Containers scanned, counted by the strategies
+        self.scanned = 0
+        self._scanned: dict[int, int] = {}
+        # Grid indexes of the containers and cells the last step was based on
+        self.base_containers: tuple[int, ...] = ()
+        self.base_cells: tuple[int, ...] = ()
 
     @abstractmethod
     def __str__(self) -> str: ...
 
+    def solve(self) -> bool:
+        """Make one step. Profiled when profiling is enabled"""
+        if not profiling.is_enabled():
+            return self._solve()
+        scanned = self.scanned
+        started = time.perf_counter()
+        result = self._solve()
+        profiling.record(
+            profiling.STRATEGIES, str(self), time.perf_counter() - started, result, self.scanned - scanned
+        )
+        return result
+
     @abstractmethod
-    def solve(self) -> bool: ...
+    def _solve(self) -> bool: ...
+
+    def _set_base(self, *, containers: Iterable[Container] = (), cells: Iterable[Cell] = ()) -> None:
+        self.base_containers = tuple(sorted(cont.grid_idx for cont in containers))
+        self.base_cells = tuple(sorted(cell.idx for cell in cells))
+
+    def _is_scanned(self, region: int, version: int) -> bool:
+        if self.track_changes and self._scanned.get(region) == version:
+            self.skipped += 1
+            return True
+        return False
+
+    def _set_scanned(self, region: int, version: int) -> None:
+        if self.track_changes:
+            self._scanned[region] = version
 
     def _get_candidate_cells_map(
         self, container: Container, *, min_cells: int = 1, max_cells: int = 9, candidates: Iterable[int] = range(1, 10)
     ) -> dict[int, tuple[Cell, ...]]:
         result: dict[int, tuple[Cell, ...]] = {}
+        cont_cells = container.cells
         for cand in candidates:
-            cells = tuple(container.filter_cells(has_candidate=cand))
-            if min_cells <= len(cells) <= max_cells:
-                result[cand] = cells
+            positions = self._grid.get_candidate_positions(container, cand)
+            if min_cells <= bitmask.popcount(positions) <= max_cells:
+                result[cand] = tuple(cont_cells[pos] for pos in bitmask.to_positions(positions))
         return result
@@ -0,0 +1,98 @@
+import threading
+import time
+from typing import Iterable, MutableMapping, Sequence
+
+from .strategies.strategy import Strategy
+
+
+class StrategyStats:
+    """Measured calls, hits and run time of a strategy"""
+
+    __slots__ = ("calls", "hits", "seconds")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.hits = 0
+        self.seconds = 0.0
+
+    def __repr__(self) -> str:
+        return f"StrategyStats(calls={self.calls}, hits={self.hits}, seconds={self.seconds:.6f})"
+
+    @property
+    def expected_cost(self) -> float:
+        """Expected run time until the strategy hits: mean cost over the smoothed hit rate. 0 until measured"""
+        if not self.calls:
+            return 0.0
+        return self.seconds / self.calls * (self.calls + 2) / (self.hits + 1)
+
+
+# Strategy name -> stats shared by the schedulers of a process, so short lived solvers learn from previous ones
+_shared_stats: dict[str, StrategyStats] = {}
+# Guards the stats updates: solvers may run in several threads of a process
+_stats_lock = threading.Lock()
+
+
+class StrategyScheduler:
+    """Runs strategies until one makes progress.
+    Strict: strategies are tried in the given (difficulty) order, the simplest applicable strategy makes the step.
+    Calls aren't timed by the scheduler, Strategy.solve profiles them when profiling is enabled.
+    Adaptive: strategies are tried by the lowest expected cost until a hit, not measured ones first in the given order.
+    Calls are timed for the stats.
+    Every strategy is still tried before giving up, so both modes get stuck on the same grids
+    """
+
+    def __init__(
+        self,
+        strategies: Sequence[Strategy],
+        *,
+        strict: bool = True,
+        stats: MutableMapping[str, StrategyStats] | None = None,
+    ):
+        self._strategies = tuple(strategies)
+        self.strict = strict
+        self._stats = _shared_stats if stats is None else stats
+        with _stats_lock:
+            self._strategy_stats = tuple(
+                self._stats.setdefault(str(strategy), StrategyStats()) for strategy in strategies
+            )
+
+    @property
+    def strategies(self) -> tuple[Strategy, ...]:
+        return self._strategies
+
+    @property
+    def stats(self) -> MutableMapping[str, StrategyStats]:
+        return self._stats
+
+    def get_order(self) -> tuple[Strategy, ...]:
+        return tuple(self._strategies[idx] for idx in self._get_order())
+
+    def run(self) -> Strategy | None:
+        """Strategy that made a step, None when none applies"""
+        for idx in self._get_order():
+            strategy = self._strategies[idx]
+            if self.strict:
+                if strategy.solve():
+                    return strategy
+                continue
+            started = time.perf_counter()
+            result = strategy.solve()
+            self._record(idx, time.perf_counter() - started, result)
+            if result:
+                return strategy
+        return None
+
+    def _record(self, idx: int, seconds: float, hit: bool) -> None:
+        stats = self._strategy_stats[idx]
+        with _stats_lock:
+            stats.seconds += seconds
+            stats.calls += 1
+            stats.hits += hit
+
+    def _get_order(self) -> Iterable[int]:
+        if self.strict:
+            return range(len(self._strategies))
+        with _stats_lock:
+            costs = [stats.expected_cost for stats in self._strategy_stats]
+        # sort is stable: ties keep the difficulty order
+        return sorted(range(len(self._strategies)), key=costs.__getitem__)
@@ -0,0 +1,239 @@
+import asyncio
+import atexit
+import multiprocessing
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from logging import getLogger
+from multiprocessing.connection import Connection
+from multiprocessing.context import SpawnContext
+from multiprocessing.process import BaseProcess
+from multiprocessing.reduction import ForkingPickler
+from queue import Empty, Queue
+from time import monotonic
+from typing import Callable, ParamSpec, Sequence, TypeVar, cast
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+_P = ParamSpec("_P")
+
+
+class SolverPoolException(Exception):
+    pass
+
+
+class SolverPoolTimeout(SolverPoolException):
+    pass
+
+
+class _Worker:
+    def __init__(self, context: SpawnContext, initializer: Callable[[], object] | None):
+        self.connection, child_connection = context.Pipe()
+        self.process: BaseProcess = context.Process(
+            target=_worker_main, args=(child_connection, initializer), daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+        self.tasks_count = 0
+
+    def __str__(self) -> str:
+        return f"Worker[{self.process.pid}]"
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class SolverPool:
+    """Preforked solver processes. Every task has a deadline:
+    a worker that misses it is killed and replaced, the caller gets SolverPoolTimeout.
+    Workers are also recycled after max_tasks tasks, and after a task that raised.
+    Recycled workers are killed and replaced by a background thread, callers don't wait for the new process.
+    Thread safe: tasks can be run from concurrent request threads, or awaited with arun from an event loop
+    """
+
+    def __init__(self, size: int, *, max_tasks: int = 1000, initializer: Callable[[], object] | None = None):
+        self._logger = getLogger(__name__)
+        self._size = size
+        self._max_tasks = max_tasks
+        self._initializer = initializer
+        # workers are spawned, not forked from a (possibly multithreaded) web server worker
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: Queue[_Worker] = Queue()
+        self._workers: set[_Worker] = set()
+        # recycled workers, None stops the replacing thread
+        self._recycled: Queue[_Worker | None] = Queue()
+        self._lock = threading.Lock()
+        self._is_started = False
+        # one thread per worker: awaiting tasks queue in the executor, not in threads blocked on idle workers
+        self._executor = ThreadPoolExecutor(size, thread_name_prefix="solver-pool")
+
+    def __str__(self) -> str:
+        return "SolverPool"
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def start(self) -> None:
+        with self._lock:
+            if self._is_started:
+                return
+            self._logger.info("%s: Starting %d workers", self, self._size)
+            for _ in range(self._size):
+                self._idle.put(self._spawn())
+            self._recycled = Queue()
+            threading.Thread(
+                target=self._replace_workers, args=(self._recycled,), name="solver-pool-replacer", daemon=True
+            ).start()
+            self._is_started = True
+            atexit.register(self.shutdown)
+
+    def shutdown(self) -> None:
+        atexit.unregister(self.shutdown)
+        with self._lock:
+            self._recycled.put(None)
+            for worker in self._workers:
+                worker.kill()
+            self._workers.clear()
+            self._idle = Queue()
+            self._is_started = False
+
+    def run(self, timeout: float, func: Callable[_P, _R], *args: _P.args, **kwargs: _P.kwargs) -> _R:
+        """Run func in a worker process. func, args and result must be picklable"""
+        self.start()
+        deadline = monotonic() + timeout
+        task = bytes(ForkingPickler.dumps(partial(func, *args, **kwargs)))
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except Empty:
+            raise SolverPoolTimeout(f"{self}: No idle worker in {timeout:.2f}s")
+        return cast(_R, self._run_task(worker, deadline, timeout, task))
+
+    def run_all(self, timeout: float, func: Callable[_P, _R], *args: _P.args, **kwargs: _P.kwargs) -> list[_R]:
+        """Run func once in every worker, for per process state. Workers are held until all of them are idle,
+        results of workers not idle in time or failed are left out
+        """
+        self.start()
+        deadline = monotonic() + timeout
+        task = bytes(ForkingPickler.dumps(partial(func, *args, **kwargs)))
+        workers: list[_Worker] = []
+        try:
+            while len(workers) < self._size:
+                workers.append(self._idle.get(timeout=max(0.0, deadline - monotonic())))
+        except Empty:
+            self._logger.warning("%s: %d of %d workers idle in %.2fs", self, len(workers), self._size, timeout)
+        results: list[_R] = []
+        for worker in workers:
+            try:
+                results.append(cast(_R, self._run_task(worker, deadline, timeout, task)))
+            except SolverPoolException as e:
+                self._logger.warning("%s", e)
+        return results
+
+    def _run_task(self, worker: _Worker, deadline: float, timeout: float, task: bytes) -> object:
+        """Run the pickled task in the taken worker and return it to the idle or the recycled ones"""
+        recycle = True
+        try:
+            try:
+                worker.connection.send_bytes(task)
+                if not worker.connection.poll(max(0.0, deadline - monotonic())):
+                    raise SolverPoolTimeout(f"{self}: {worker} missed {timeout:.2f}s deadline")
+                is_ok, result = ForkingPickler.loads(worker.connection.recv_bytes())
+            except (OSError, EOFError, pickle.UnpicklingError) as e:
+                raise SolverPoolException(f"{self}: {worker} failed: {e!r}")
+            if not is_ok:
+                # the worker exits after a task that raised
+                raise SolverPoolException(f"{self}: Task failed: {result}")
+            recycle = False
+        except SolverPoolException as e:
+            self._logger.warning("%s. Worker recycled", e)
+            raise
+        finally:
+            worker.tasks_count += 1
+            if recycle or worker.tasks_count >= self._max_tasks:
+                self._recycled.put(worker)
+            else:
+                self._idle.put(worker)
+        return result
+
+    async def arun(self, timeout: float, func: Callable[_P, _R], *args: _P.args, **kwargs: _P.kwargs) -> _R:
+        """run for event loops. The deadline includes time spent waiting for a free worker"""
+        deadline = monotonic() + timeout
+
+        def run_until_deadline() -> _R:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                raise SolverPoolTimeout(f"{self}: No idle worker in {timeout:.2f}s")
+            return self.run(remaining, func, *args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, run_until_deadline)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except TimeoutError:
+            raise SolverPoolTimeout(f"{self}: Task missed {timeout:.2f}s deadline")
+
+    def map(self, timeout: float, func: Callable[[Sequence[_T]], list[_R]], items: Sequence[_T]) -> list[_R | None]:
+        """Split items into chunks and process them concurrently, func maps a chunk into results.
+        Results are in items order, None for items of timed out or failed chunks
+        """
+        if not items:
+            return []
+        chunksize = -(-len(items) // self._size)
+        chunks = [items[i : i + chunksize] for i in range(0, len(items), chunksize)]
+        results: list[list[_R] | None] = [None] * len(chunks)
+
+        def run_chunk(idx: int) -> None:
+            try:
+                results[idx] = self.run(timeout, func, chunks[idx])
+            except SolverPoolException as e:
+                self._logger.warning("%s: Chunk %d: %s", self, idx, e)
+
+        threads = [threading.Thread(target=run_chunk, args=(idx,)) for idx in range(1, len(chunks))]
+        for thread in threads:
+            thread.start()
+        run_chunk(0)
+        for thread in threads:
+            thread.join()
+        return [
+            chunk_results[i] if chunk_results is not None else None
+            for chunk, chunk_results in zip(chunks, results)
+            for i in range(len(chunk))
+        ]
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._context, self._initializer)
+        self._workers.add(worker)
+        return worker
+
+    def _replace_workers(self, recycled: "Queue[_Worker | None]") -> None:
+        """Replacing thread: kill recycled workers and make new ones idle, until shutdown"""
+        while (worker := recycled.get()) is not None:
+            with self._lock:
+                # workers of a shut down pool are already killed
+                if worker not in self._workers:
+                    continue
+                self._workers.discard(worker)
+                worker.kill()
+                self._idle.put(self._spawn())
+
+
+def _worker_main(
+    connection: "Connection[tuple[bool, object], Callable[[], object]]", initializer: Callable[[], object] | None
+) -> None:
+    if initializer is not None:
+        initializer()
+    while True:
+        try:
+            task = connection.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        try:
+            result = task()
+        except Exception as e:
+            connection.send((False, repr(e)))
+            raise
+        connection.send((True, result))
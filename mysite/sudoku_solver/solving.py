@@ -0,0 +1,451 @@
+import asyncio
+import base64
+import os
+from array import array
+from functools import partial
+from hashlib import blake2b
+from typing import Sequence, TypedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .solution_cache import SolutionCache
+from .solver import (
+    BacktrackingSearch,
+    BruteForcer,
+    DancingLinks,
+    Rating,
+    Solver,
+    SolverException,
+    StepSolver,
+    count_solutions,
+    profiling,
+    rate,
+    rate_difficulty,
+)
+from .solver_pool import SolverPool
+from .sudoku import Grid, GridState, SudokuException
+from .utils import board_utils
+from .utils.symmetry import canonicalize, get_canonical_digest
+
+SOLVE_ENGINES: dict[str, type[Solver]] = {"backtracking": BruteForcer, "dlx": DancingLinks}
+DEFAULT_ENGINE = "backtracking"
+STEP_ENGINE = "step"
+# hints cache keys version, bump when hints change for the same board
+HINT_VERSION = 1
+_CONTAINER_TYPES = ("row", "column", "box")
+
+_SOLVERS: dict[str, type[Solver]] = {**SOLVE_ENGINES, STEP_ENGINE: StepSolver}
+
+_pool: SolverPool | None = None
+_solution_cache: SolutionCache | None = None
+
+
+class LogicalStep(TypedDict):
+    strategy: str
+    placements: list[tuple[int, int]]  # cell index, value
+    eliminations: list[tuple[int, int]]  # cell index, removed candidates mask of unsolved cells
+
+
+class HintContainer(TypedDict):
+    type: str  # row, column or box
+    index: int
+
+
+class Hint(TypedDict):
+    strategy: str
+    base_containers: list[HintContainer]
+    base_cells: list[int]  # cells the step is based on
+    cells: list[int]  # target cells: placed or with eliminated candidates
+    placements: list[tuple[int, int]]
+    eliminations: list[tuple[int, int]]
+
+
+# solve result, solution to keep in the local cache tier (None when not cacheable), shared cache tier hit
+CachedSolve = tuple[dict[str, str], tuple[int, ...] | None, bool]
+
+
+class GivensAnalysis(TypedDict):
+    solution: str  # 81 digits, empty when there is no solution
+    solution_count: int  # up to 2
+    givens_count: int
+    difficulty: int | None  # only for unique solution givens
+    canonical_digest: str  # get_canonical_digest, equal for transformed copies of the givens
+
+
+def solve_board(board: object, engine: str = DEFAULT_ENGINE) -> dict[str, str]:
+    """Solve a comma separated encoded or packed board, packed results are base64 encoded.
+    Result status: solved, unsolved, invalid or error
+    """
+    if not isinstance(board, (str, bytes)):
+        return {"status": "invalid", "error": "board is invalid"}
+    try:
+        grid = board_utils.parse_board_data(board).to_grid()
+    except board_utils.BoardParseError as e:
+        return {"status": "invalid", "error": f"board is invalid: {e}"}
+    return _solve_grid(grid, engine, packed=isinstance(board, bytes))
+
+
+def solve_boards(boards: Sequence[object], engine: str = DEFAULT_ENGINE) -> list[dict[str, str]]:
+    return [solve_board(board, engine) for board in boards]
+
+
+def solve_parsed_board(board: board_utils.ParsedBoard, engine: str, packed: bool = False) -> CachedSolve:
+    """Solve a local solution cache miss, the givens canonical form is looked up in the shared tier first.
+    Runs in the solver pool: canonicalization, shared tier lookup and solve are a single task
+    """
+    givens = tuple(board.givens)
+    canonical_givens, transform = canonicalize(givens)
+    cache = get_solution_cache()
+    if (solution := cache.get_shared(engine, canonical_givens, transform)) is not None:
+        return get_solution_result(givens, solution, packed=packed), solution, True
+    result = _solve_grid(board.to_grid(), engine, packed=packed)
+    if (solution := _get_result_solution(result)) is not None:
+        cache.set_shared(engine, solution, canonical_givens, transform)
+    return result, solution, False
+
+
+def analyze_givens(givens: Sequence[int]) -> GivensAnalysis:
+    solutions = BacktrackingSearch(givens).solutions(2)
+    return {
+        "solution": "".join(map(str, solutions[0])) if solutions else "",
+        "solution_count": len(solutions),
+        "givens_count": sum(1 for value in givens if value),
+        "difficulty": rate_difficulty(Grid(givens)) if len(solutions) == 1 else None,
+        "canonical_digest": get_canonical_digest(givens),
+    }
+
+
+def analyze_puzzles(puzzles: Sequence[Sequence[int]]) -> list[GivensAnalysis]:
+    return [analyze_givens(givens) for givens in puzzles]
+
+
+def get_canonical_digests(puzzles: Sequence[Sequence[int]]) -> list[str]:
+    return [get_canonical_digest(givens) for givens in puzzles]
+
+
+def rate_puzzles(puzzles: Sequence[Sequence[int]]) -> list[Rating]:
+    return [rate(Grid(givens)) for givens in puzzles]
+
+
+def get_solution_result(givens: Sequence[int], solution: Sequence[int], *, packed: bool = False) -> dict[str, str]:
+    """solve_board result of the givens solution, empty solution is unsolved"""
+    if not solution:
+        return {"status": "unsolved", "reason": "No solution found"}
+    if packed:
+        return {"status": "solved", "result": encode_packed(board_utils.pack_values(givens, solution))}
+    result = ",".join(f"-{value}" if given else f"+{value}" for given, value in zip(givens, solution))
+    return {"status": "solved", "result": result}
+
+
+def encode_packed(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def decode_packed(data: str) -> bytes | None:
+    """Packed board bytes of base64 transport, None when it isn't valid base64"""
+    try:
+        return base64.b64decode(data, validate=True)
+    except ValueError:
+        return None
+
+
+def solve_logically(board: object, strict: bool = True) -> dict[str, object]:
+    """Run the step solver until the board is solved or no strategy applies.
+    Strict steps use the simplest applicable strategy, otherwise the scheduler picks the fastest to find.
+    Result status: solved, stuck, invalid or error. Solved and stuck results hold the final board,
+    packed boards base64 encoded, and the steps trace to replay it
+    """
+    if not isinstance(board, (str, bytes)):
+        return {"status": "invalid", "error": "board is invalid"}
+    try:
+        grid = board_utils.parse_board_data(board).to_grid()
+    except board_utils.BoardParseError as e:
+        return {"status": "invalid", "error": f"board is invalid: {e}"}
+    state = grid.state
+    solver = StepSolver(grid, strict=strict)
+    steps: list[LogicalStep] = []
+    try:
+        while not grid.is_solved:
+            values, masks = state.values[:], state.masks[:]
+            if not solver.solve():
+                break
+            placements, eliminations = _get_step_changes(state, values, masks)
+            steps.append(
+                {"strategy": str(solver.last_strategy), "placements": placements, "eliminations": eliminations}
+            )
+    except (SudokuException, SolverException) as e:
+        return {"status": "error", "error": str(e)}
+    result = (
+        encode_packed(board_utils.pack_board(grid)) if isinstance(board, bytes) else board_utils.encode_board(grid)
+    )
+    return {"status": "solved" if grid.is_solved else "stuck", "result": result, "steps": steps}
+
+
+def get_hint(board: bytes) -> Hint | None:
+    """Next simplest step of a validated packed board, None when the board is solved or no strategy applies.
+    The step is made on a decoded copy and reported, not applied
+    """
+    grid = board_utils.parse_packed(board).to_grid()
+    if grid.is_solved:
+        return None
+    state = grid.state
+    values, masks = state.values[:], state.masks[:]
+    solver = StepSolver(grid)
+    try:
+        if not solver.solve() or (strategy := solver.last_strategy) is None:
+            return None
+    except (SudokuException, SolverException):
+        return None
+    placements, eliminations = _get_step_changes(state, values, masks)
+    return {
+        "strategy": str(strategy),
+        "base_containers": [
+            {"type": _CONTAINER_TYPES[idx // 9], "index": idx % 9} for idx in strategy.base_containers
+        ],
+        "base_cells": list(strategy.base_cells),
+        "cells": sorted({idx for idx, _ in placements} | {idx for idx, _ in eliminations}),
+        "placements": placements,
+        "eliminations": eliminations,
+    }
+
+
+def get_hint_cache_key(board: bytes) -> str:
+    return f"hint:{HINT_VERSION}:{blake2b(board, digest_size=16).hexdigest()}"
+
+
+async def aoffload_get_hint(board: bytes) -> Hint | None:
+    """get_hint in the solver pool, hints (no hint too) are cached by the board state"""
+    cache = caches["default"]
+    key = get_hint_cache_key(board)
+    if (cached := await cache.aget(key)) is not None:
+        hint: Hint | None = cached["hint"]
+        return hint
+    hint = await get_pool().arun(get_solve_timeout(), get_hint, board)
+    await cache.aset(key, {"hint": hint}, timeout=float(getattr(settings, "HINT_CACHE_TIMEOUT", 86400)))
+    return hint
+
+
+def offload_solve_board(board: object, engine: str = DEFAULT_ENGINE) -> dict[str, str]:
+    """solve_board in the solver pool, results are cached. Raises SolverPoolTimeout when the deadline is missed.
+    A local cache miss is a single solver pool task, see solve_parsed_board
+    """
+    parsed = _parse_cacheable_board(board, engine)
+    if parsed is None:
+        return get_pool().run(get_solve_timeout(), solve_board, board, engine)
+    if (result := _get_local_result(board, parsed, engine)) is not None:
+        return result
+    solved = get_pool().run(get_solve_timeout(), solve_parsed_board, parsed, engine, isinstance(board, bytes))
+    return _keep_solved(parsed, engine, solved)
+
+
+def offload_solve_boards(boards: Sequence[object], engine: str = DEFAULT_ENGINE) -> list[dict[str, str]]:
+    """solve_boards across the solver pool, only local cache misses are sent to it.
+    Results are in boards order, items of failed chunks get timeout status
+    """
+    results: list[dict[str, str] | None] = [None] * len(boards)
+    misses: dict[int, board_utils.ParsedBoard | None] = {}
+    for idx, board in enumerate(boards):
+        parsed = _parse_cacheable_board(board, engine)
+        if parsed is not None and (result := _get_local_result(board, parsed, engine)) is not None:
+            results[idx] = result
+        else:
+            misses[idx] = parsed
+    tasks = [
+        (boards[idx] if parsed is None else parsed, isinstance(boards[idx], bytes)) for idx, parsed in misses.items()
+    ]
+    solved = get_pool().map(get_solve_timeout(), partial(_solve_boards_cached, engine=engine), tasks)
+    for (idx, parsed), item in zip(misses.items(), solved):
+        if item is not None:
+            results[idx] = item[0] if parsed is None else _keep_solved(parsed, engine, item)
+    return [result or {"status": "timeout", "error": "Solve timed out"} for result in results]
+
+
+def offload_count_solutions(givens: Sequence[int], limit: int) -> int:
+    return get_pool().run(get_solve_timeout(), _count_solutions, tuple(givens), limit)
+
+
+def get_pool_profiles() -> dict[str, dict[str, profiling.ProfileData]]:
+    """Solvers and strategies profiles summed over the solver pool workers"""
+    return profiling.merge_profiles(get_pool().run_all(get_solve_timeout(), profiling.get_profiles))
+
+
+def set_pool_profiling(enabled: bool) -> int:
+    """Enable or disable profiling of the solver pool workers, count of workers set.
+    Recycled workers start from the SOLVER_PROFILING setting
+    """
+    return len(get_pool().run_all(get_solve_timeout(), profiling.set_enabled, enabled))
+
+
+def reset_pool_profiles() -> int:
+    """Clear the solver pool workers profiles, count of workers reset"""
+    return len(get_pool().run_all(get_solve_timeout(), profiling.reset))
+
+
+async def aoffload_solve_board(board: object, engine: str = DEFAULT_ENGINE) -> dict[str, str]:
+    parsed = _parse_cacheable_board(board, engine)
+    if parsed is None:
+        return await get_pool().arun(get_solve_timeout(), solve_board, board, engine)
+    if (result := _get_local_result(board, parsed, engine)) is not None:
+        return result
+    solved = await get_pool().arun(get_solve_timeout(), solve_parsed_board, parsed, engine, isinstance(board, bytes))
+    return _keep_solved(parsed, engine, solved)
+
+
+async def aoffload_solve_boards(boards: Sequence[object], engine: str = DEFAULT_ENGINE) -> list[dict[str, str]]:
+    return await asyncio.to_thread(offload_solve_boards, boards, engine)
+
+
+async def aoffload_count_solutions(givens: Sequence[int], limit: int) -> int:
+    return await get_pool().arun(get_solve_timeout(), _count_solutions, tuple(givens), limit)
+
+
+async def aoffload_solve_logically(board: object, strict: bool = True) -> dict[str, object]:
+    return await get_pool().arun(get_solve_timeout(), solve_logically, board, strict)
+
+
+def offload_rate_puzzles(
+    puzzles: Sequence[Sequence[int]], *, pool: SolverPool | None = None, timeout: float | None = None
+) -> list[Rating | None]:
+    """rate_puzzles across the solver pool, None for puzzles of chunks that missed the timeout or failed"""
+    pool = pool or get_pool()
+    return pool.map(timeout or get_solve_timeout(), rate_puzzles, [tuple(givens) for givens in puzzles])
+
+
+def offload_analyze_puzzles(
+    puzzles: Sequence[Sequence[int]], *, pool: SolverPool | None = None, timeout: float | None = None
+) -> list[GivensAnalysis | None]:
+    """analyze_puzzles across the solver pool, None for puzzles of chunks that missed the timeout or failed"""
+    pool = pool or get_pool()
+    return pool.map(timeout or get_solve_timeout(), analyze_puzzles, [tuple(givens) for givens in puzzles])
+
+
+def offload_get_canonical_digests(
+    puzzles: Sequence[Sequence[int]], *, pool: SolverPool | None = None, timeout: float | None = None
+) -> list[str | None]:
+    pool = pool or get_pool()
+    return pool.map(timeout or get_solve_timeout(), get_canonical_digests, [tuple(givens) for givens in puzzles])
+
+
+def offload_analyze_givens(givens: Sequence[int]) -> GivensAnalysis:
+    return get_pool().run(get_solve_timeout(), analyze_givens, tuple(givens))
+
+
+async def aoffload_analyze_givens(givens: Sequence[int]) -> GivensAnalysis:
+    return await get_pool().arun(get_solve_timeout(), analyze_givens, tuple(givens))
+
+
+def get_pool() -> SolverPool:
+    global _pool
+    if _pool is None:
+        _pool = SolverPool(
+            int(getattr(settings, "SOLVER_POOL_WORKERS", 0)) or os.cpu_count() or 1,
+            max_tasks=int(getattr(settings, "SOLVER_POOL_MAX_TASKS", 1000)),
+            initializer=partial(_warm_up, bool(getattr(settings, "SOLVER_PROFILING", False))),
+        )
+    return _pool
+
+
+def get_solution_cache() -> SolutionCache:
+    global _solution_cache
+    if _solution_cache is None:
+        _solution_cache = SolutionCache(
+            int(getattr(settings, "SOLUTION_CACHE_SIZE", 4096)),
+            timeout=float(getattr(settings, "SOLUTION_CACHE_TIMEOUT", 86400)),
+        )
+    return _solution_cache
+
+
+def get_solve_timeout() -> float:
+    return float(getattr(settings, "SOLVE_TIMEOUT", 5.0))
+
+
+def get_batch_max_size() -> int:
+    return int(getattr(settings, "SOLVE_BATCH_MAX_SIZE", 1000))
+
+
+def _warm_up(profile: bool = False) -> None:
+    """Build solvers lookup tables before the first task"""
+    from .solver.dancing_links import get_exact_cover_matrix
+
+    profiling.set_enabled(profile)
+    get_exact_cover_matrix()
+
+
+def _get_step_changes(
+    state: GridState, values: bytearray, masks: "array[int]"
+) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+    """Placements (cell index, value) and eliminations (cell index, removed candidates mask of unsolved cells)
+    of the state since values and masks
+    """
+    placements = [(idx, value) for idx, (value, old) in enumerate(zip(state.values, values)) if value != old]
+    eliminations = [
+        (idx, old & ~mask)
+        for idx, (mask, old) in enumerate(zip(state.masks, masks))
+        if old & ~mask and not state.values[idx]
+    ]
+    return placements, eliminations
+
+
+def _parse_cacheable_board(board: object, engine: str) -> board_utils.ParsedBoard | None:
+    """Board to key the solve result by its givens. None for step solving, its result depends on
+    the whole board state, and for invalid boards: solve_board reports them
+    """
+    if engine not in SOLVE_ENGINES or not isinstance(board, (str, bytes)):
+        return None
+    try:
+        return board_utils.parse_board_data(board)
+    except board_utils.BoardParseError:
+        return None
+
+
+def _get_local_result(board: object, parsed: board_utils.ParsedBoard, engine: str) -> dict[str, str] | None:
+    givens = tuple(parsed.givens)
+    if (solution := get_solution_cache().get(givens, engine)) is None:
+        return None
+    return get_solution_result(givens, solution, packed=isinstance(board, bytes))
+
+
+def _keep_solved(parsed: board_utils.ParsedBoard, engine: str, solved: CachedSolve) -> dict[str, str]:
+    """Keep the solve_parsed_board solution in the local tier, its result"""
+    result, solution, shared_hit = solved
+    if solution is not None:
+        get_solution_cache().set(tuple(parsed.givens), engine, solution, shared_hit=shared_hit)
+    return result
+
+
+def _solve_boards_cached(boards: Sequence[tuple[object, bool]], engine: str) -> list[CachedSolve]:
+    """solve_parsed_board of parsed boards, solve_board (not cached) of the others"""
+    return [
+        solve_parsed_board(board, engine, packed)
+        if isinstance(board, board_utils.ParsedBoard)
+        else (solve_board(board, engine), None, False)
+        for board, packed in boards
+    ]
+
+
+def _solve_grid(grid: Grid, engine: str, *, packed: bool) -> dict[str, str]:
+    try:
+        if _SOLVERS[engine](grid).solve():
+            if packed:
+                return {"status": "solved", "result": encode_packed(board_utils.pack_board(grid))}
+            return {"status": "solved", "result": board_utils.encode_board(grid)}
+    except (SudokuException, SolverException) as e:
+        return {"status": "error", "error": str(e)}
+    return {"status": "unsolved", "reason": "No solution found"}
+
+
+def _get_result_solution(result: dict[str, str]) -> tuple[int, ...] | None:
+    """Solution to cache, empty when there is none. None when the result is not cacheable"""
+    match result["status"]:
+        case "solved":
+            data = result["result"]
+            return board_utils.decode_board_data_values(data if "," in data else base64.b64decode(data))
+        case "unsolved":
+            return ()
+        case _:
+            return None
+
+
+def _count_solutions(givens: tuple[int, ...], limit: int) -> int:
+    return count_solutions(Grid(givens), limit)
@@ -1,15 +1,22 @@
+from . import bitmask, topology
 from .cell import Cell
+from .change_journal import ChangeJournal, as_complex_action
 from .container import Container
 from .exceptions import HistoryManagerException, SudokuException
 from .grid import Grid
-from .history_manager import HistoryManager, as_complex_action
+from .grid_state import GridState
+from .history_manager import HistoryManager
 
 __all__ = [
+    "bitmask",
+    "topology",
     "Cell",
+    "ChangeJournal",
     "Container",
     "HistoryManagerException",
     "SudokuException",
     "Grid",
+    "GridState",
     "HistoryManager",
     "as_complex_action",
 ]
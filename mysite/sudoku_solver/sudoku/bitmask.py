@@ -0,0 +1,37 @@
+"""9-bit candidates masks: bit (d - 1) is set when digit d is a candidate"""
+
+from typing import Iterable
+
+FULL_MASK = 0x1FF
+
+_DIGITS = tuple(tuple(d for d in range(1, 10) if mask >> (d - 1) & 1) for mask in range(FULL_MASK + 1))
+_FROZENSETS = tuple(frozenset(digits) for digits in _DIGITS)
+_POSITIONS = tuple(tuple(d - 1 for d in digits) for digits in _DIGITS)
+
+
+def digit_bit(digit: int) -> int:
+    return 1 << (digit - 1)
+
+
+def to_mask(digits: Iterable[int]) -> int:
+    result = 0
+    for digit in digits:
+        result |= 1 << (digit - 1)
+    return result
+
+
+def to_digits(mask: int) -> tuple[int, ...]:
+    return _DIGITS[mask]
+
+
+def to_positions(mask: int) -> tuple[int, ...]:
+    """Set bits indexes of a container positions mask"""
+    return _POSITIONS[mask]
+
+
+def to_frozenset(mask: int) -> frozenset[int]:
+    return _FROZENSETS[mask]
+
+
+def popcount(mask: int) -> int:
+    return mask.bit_count()
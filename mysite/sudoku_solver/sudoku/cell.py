@@ -1,99 +1,115 @@
 from logging import getLogger
-from typing import Callable, Iterable
-
-from events import Events
+from typing import Iterable
 
+from . import bitmask, topology
 from .exceptions import SudokuException
+from .grid_state import GridState
+
+_logger = getLogger(__name__)
 
 
 class Cell:
-    def __init__(self, value: int, i: int, j: int):
-        self._logger = getLogger(__name__)
-        self._events = Events()
-        self._coordinates = i, j
-        self._candidates: frozenset[int] = frozenset()
-        self._validate_value(value)
-        self._value = value
-        self._is_given = self._value != 0
-        self._validate_coordinates()
+    """Lightweight view of a single cell of a GridState"""
+
+    __slots__ = ("_idx", "_state")
+
+    def __init__(self, state: GridState, idx: int):
+        self._state = state
+        self._idx = idx
+        self._validate_idx()
 
     def __str__(self) -> str:
-        return f"r{self._coordinates[1]}c{self._coordinates[0]}"
+        return f"r{topology.ROW_OF[self._idx]}c{topology.COLUMN_OF[self._idx]}"
 
     def __repr__(self) -> str:
         return str(self)
 
     def __lt__(self, other: object) -> bool:
         if isinstance(other, Cell):
-            return self._coordinates < other._coordinates
+            return self.coordinates < other.coordinates
         return NotImplemented
 
     @property
     def coordinates(self) -> tuple[int, int]:
-        return self._coordinates
+        return topology.COLUMN_OF[self._idx], topology.ROW_OF[self._idx]
+
+    @property
+    def idx(self) -> int:
+        return self._idx
 
     @property
     def candidates(self) -> frozenset[int]:
-        return self._candidates
+        return bitmask.to_frozenset(self._state.masks[self._idx])
 
     @candidates.setter
     def candidates(self, candidates: Iterable[int]) -> None:
         cands = frozenset(candidates)
-        if self._candidates == cands:
+        for cand in cands:
+            self._validate_value(cand, allow_zero=False)
+        self.candidates_mask = bitmask.to_mask(cands)
+
+    @property
+    def candidates_mask(self) -> int:
+        return self._state.masks[self._idx]
+
+    @candidates_mask.setter
+    def candidates_mask(self, mask: int) -> None:
+        current = self._state.masks[self._idx]
+        if current == mask:
             return
-        self._logger.info("%s: Updating candidates %s -> %s", self, self._candidates, cands)
+        _logger.info("%s: Updating candidates %s -> %s", self, current, mask)
         self._assert_mutable()
         self._assert_candidates_mutable()
-        for cand in cands:
-            self._validate_value(cand, allow_zero=False)
-        self._candidates = cands
-        self._logger.debug("%s: On change: set candidates", self)
-        self._events.on_change(self)
+        self._validate_mask(mask)
+        self._state.set_mask(self._idx, mask)
+
+    @property
+    def candidates_count(self) -> int:
+        return bitmask.popcount(self._state.masks[self._idx])
 
     @property
     def value(self) -> int:
-        return self._value
+        return self._state.values[self._idx]
 
     @value.setter
     def value(self, value: int) -> None:
-        if self._value == value:
+        current = self._state.values[self._idx]
+        if current == value:
             return
-        self._logger.info("%s: Updating value %d -> %d", self, self._value, value)
+        _logger.info("%s: Updating value %d -> %d", self, current, value)
         self._assert_mutable()
         self._validate_value(value)
-        self._value = value
-        self._candidates = frozenset()
-        self._logger.debug("%s: On change: set value", self)
-        self._events.on_change(self)
+        self._state.set_value(self._idx, value)
 
     @property
     def is_given(self) -> bool:
-        return self._is_given
+        return self._state.givens[self._idx] != 0
 
     @property
     def is_solved(self) -> bool:
-        return self._value != 0
+        return self._state.values[self._idx] != 0
 
-    def add_on_change_handler(self, handler: Callable[["Cell"], None]) -> None:
-        self._events.on_change += handler
+    def has_candidate(self, candidate: int) -> bool:
+        return bool(self._state.masks[self._idx] >> (candidate - 1) & 1)
 
-    def remove_on_change_handler(self, handler: Callable[["Cell"], None]) -> None:
-        self._events.on_change -= handler
+    def remove_candidate(self, candidate: int) -> None:
+        self._validate_value(candidate, allow_zero=False)
+        self.candidates_mask = self._state.masks[self._idx] & ~bitmask.digit_bit(candidate)
 
-    def get_state(self) -> tuple[int, frozenset[int]]:
-        return self._value, self._candidates
+    def get_state(self) -> tuple[int, int]:
+        return self._state.values[self._idx], self._state.masks[self._idx]
 
-    def restore(self, state: tuple[int, frozenset[int]]) -> None:
-        self._logger.info("%s: Restoring %s", self, state)
+    def restore(self, state: tuple[int, int]) -> None:
+        _logger.info("%s: Restoring %s", self, state)
         self._verify_state(state)
-        self.value, self.candidates = state
+        self.value, self.candidates_mask = state
 
     def reset(self) -> None:
-        self._logger.info("%s: Resetting", self)
-        if self._is_given:
+        _logger.info("%s: Resetting", self)
+        if self.is_given:
             return
         self.value = 0
-        self.candidates = frozenset()
+        self.candidates_mask = 0
 
     def _assert_mutable(self) -> None:
         if self.is_given:
@@ -107,11 +123,14 @@ class Cell:
         if value not in (range(10) if allow_zero else range(1, 10)):
             raise SudokuException(f"{self}: Invalid value {value}")
 
-    def _validate_coordinates(self) -> None:
-        col, row = self._coordinates
-        if col < 0 or row < 0 or col > 8 or row > 8:
-            raise SudokuException(f"{self}: Invalid coordinates")
+    def _validate_mask(self, mask: int) -> None:
+        if mask < 0 or mask > bitmask.FULL_MASK:
+            raise SudokuException(f"{self}: Invalid candidates mask {mask}")
+
+    def _validate_idx(self) -> None:
+        if self._idx < 0 or self._idx > 80:
+            raise SudokuException(f"Cell[{self._idx}]: Invalid coordinates")
 
-    def _verify_state(self, state: tuple[int, frozenset[int]]) -> None:
+    def _verify_state(self, state: tuple[int, int]) -> None:
         if state[0] and state[1]:
             raise SudokuException(f"{self}: State {state} is inconcistent. Cannot set solved cell candidates")
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Iterable, Iterator, NotRequired, TypedDict
 
+from . import bitmask
 from .cell import Cell
 from .exceptions import SudokuException
 
@@ -34,7 +35,7 @@ class CellsHolder(ABC):
 
     def get_cell(self, col: int, row: int) -> Cell:
         try:
-            cell = self._cells[col + row * 9]
+            cell = self.cells[col + row * 9]
         except IndexError:
             raise SudokuException(f"{self}: Coordinates {col=} {row=} out of range")
         if cell.coordinates != (col, row):
@@ -50,7 +51,21 @@ class CellsHolder(ABC):
         has_candidate: int | None = None,
         candidates: Iterable[int] | None = None,
     ) -> Iterator[Cell]:
-        result = iter(self._cells)
+        return self._filter(
+            self.cells, solved=solved, given=given, value=value, has_candidate=has_candidate, candidates=candidates
+        )
+
+    @staticmethod
+    def _filter(
+        cells: Iterable[Cell],
+        *,
+        solved: bool | None = None,
+        given: bool | None = None,
+        value: int | None = None,
+        has_candidate: int | None = None,
+        candidates: Iterable[int] | None = None,
+    ) -> Iterator[Cell]:
+        result = iter(cells)
         if solved is not None:
             result = filter(lambda cell: cell.is_solved == solved, result)
         if given is not None:
@@ -58,7 +73,8 @@ class CellsHolder(ABC):
         if value:
             result = filter(lambda cell: cell.value == value, result)
         if has_candidate:
-            result = filter(lambda cell: has_candidate in cell.candidates, result)
+            result = filter(lambda cell: cell.has_candidate(has_candidate), result)
         if candidates is not None:
-            result = filter(lambda cell: cell.candidates == frozenset(candidates), result)
+            mask = bitmask.to_mask(candidates)
+            result = filter(lambda cell: cell.candidates_mask == mask, result)
         return result
@@ -0,0 +1,115 @@
+from array import array
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Concatenate, Iterator, Mapping, ParamSpec, Protocol, TypeVar
+
+# Cell index -> (old value, old candidates mask) before the action
+JournalAction = Mapping[int, tuple[int, int]]
+
+
+class ChangeJournal:
+    """Grid level cells changes journal.
+    Records (cell index, old value, old mask) entries into preallocated buffers
+    and notifies listeners once per (complex) action.
+    Nothing is recorded (and no buffers are allocated) until the first listener is added
+    """
+
+    __slots__ = ("_capacity", "_depth", "_idxs", "_listeners", "_masks", "_size", "_values", "recording")
+
+    def __init__(self, capacity: int = 256):
+        self.recording = False
+        self._capacity = capacity
+        self._idxs = bytearray()
+        self._values = bytearray()
+        self._masks = array("H")
+        self._size = 0
+        self._depth = 0
+        self._listeners: list[Callable[[JournalAction], None]] = []
+
+    def __str__(self) -> str:
+        return "ChangeJournal"
+
+    @property
+    def is_action_open(self) -> bool:
+        return self._depth > 0
+
+    def add_listener(self, listener: Callable[[JournalAction], None]) -> None:
+        if not self._idxs:
+            self._extend(self._capacity)
+        self._listeners.append(listener)
+        self.recording = True
+
+    def remove_listener(self, listener: Callable[[JournalAction], None]) -> None:
+        self._listeners.remove(listener)
+        self.recording = bool(self._listeners)
+
+    def record(self, idx: int, value: int, mask: int) -> None:
+        """Record the cell state before its change, flush once the change is made"""
+        size = self._size
+        if size == len(self._idxs):
+            self._extend(size)
+        self._idxs[size] = idx
+        self._values[size] = value
+        self._masks[size] = mask
+        self._size = size + 1
+
+    def flush(self) -> None:
+        """Notify the listeners of a change recorded outside of an action"""
+        if not self._depth and self._size:
+            self._commit()
+
+    def begin(self) -> None:
+        self._depth += 1
+
+    def end(self) -> None:
+        self._depth -= 1
+        if not self._depth and self._size:
+            self._commit()
+
+    @contextmanager
+    def suspended(self) -> Iterator[None]:
+        """Changes made inside are not recorded"""
+        recording = self.recording
+        self.recording = False
+        try:
+            yield
+        finally:
+            self.recording = recording
+
+    def _commit(self) -> None:
+        action: dict[int, tuple[int, int]] = {}
+        idxs, values, masks = self._idxs, self._values, self._masks
+        for i in range(self._size):
+            if idxs[i] not in action:
+                action[idxs[i]] = (values[i], masks[i])
+        self._size = 0
+        for listener in self._listeners:
+            listener(action)
+
+    def _extend(self, count: int) -> None:
+        self._idxs.extend(bytes(count))
+        self._values.extend(bytes(count))
+        self._masks.frombytes(bytes(2 * count))
+
+
+class ChangeJournalHolder(Protocol):
+    @property
+    def journal(self) -> ChangeJournal: ...
+
+
+_T = TypeVar("_T")
+_P = ParamSpec("_P")
+_CJH = TypeVar("_CJH", bound=ChangeJournalHolder)
+
+
+def as_complex_action(func: Callable[Concatenate[_CJH, _P], _T]) -> Callable[Concatenate[_CJH, _P], _T]:
+    @wraps(func)
+    def wrapper(self: _CJH, /, *args: _P.args, **kwargs: _P.kwargs) -> _T:
+        journal = self.journal
+        journal.begin()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            journal.end()
+
+    return wrapper
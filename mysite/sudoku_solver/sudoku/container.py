@@ -4,6 +4,7 @@ from typing import Iterable
 from .cell import Cell
 from .cells_holder import CellsHolder
 from .exceptions import SudokuException
+from .topology import BOXES_OFFSET, COLUMNS_OFFSET, ROWS_OFFSET
 
 
 class ContainerType(Enum):
@@ -12,6 +13,9 @@ class ContainerType(Enum):
     BOX = "Box"
 
 
+_GRID_OFFSETS = {ContainerType.ROW: ROWS_OFFSET, ContainerType.COLUMN: COLUMNS_OFFSET, ContainerType.BOX: BOXES_OFFSET}
+
+
 class Container(CellsHolder):
     def __init__(self, cells: Iterable[Cell], idx: int, container_type: ContainerType):
         super().__init__(cells)
@@ -19,6 +23,7 @@ class Container(CellsHolder):
         self._container_type = container_type
         self._validate_index()
         self._validate_cells()
+        self._grid_idx = _GRID_OFFSETS[container_type] + idx
 
     def __str__(self) -> str:
         return f"{self._container_type.value}[{self._idx}]"
@@ -30,6 +35,10 @@ class Container(CellsHolder):
     def idx(self) -> int:
         return self._idx
 
+    @property
+    def grid_idx(self) -> int:
+        return self._grid_idx
+
     @property
     def is_consistent(self) -> bool:
         values = tuple(cell.value for cell in self.filter_cells(solved=True))
@@ -1,47 +1,87 @@
-from itertools import chain
 from logging import getLogger
 from typing import Iterable, Unpack
 
+from . import bitmask, topology
 from .cell import Cell
 from .cells_holder import CellsFilter, CellsHolder
+from .change_journal import ChangeJournal, as_complex_action
 from .container import Container, ContainerType
 from .exceptions import SudokuException
-from .history_manager import HistoryManager, as_complex_action
+from .grid_state import GridState
+from .history_manager import HistoryManager
 
 
 class Grid(CellsHolder):
+    """Grid state lives in a flat GridState buffer.
+    Cells, containers and history manager are lightweight views created on first access
+    """
+
     def __init__(self, field: Iterable[int | str]):
-        super().__init__(self._create_cells(field))
+        self._setup(GridState.from_values(self._adjust_field(field)))
+
+    def _setup(self, state: GridState) -> None:
         self._logger = getLogger(__name__)
-        self._history_manager = HistoryManager(self.filter_cells(given=False))
-        self._rows = tuple(self._create_row(i) for i in range(9))
-        self._columns = tuple(self._create_column(i) for i in range(9))
-        self._boxes = tuple(self._create_box(i) for i in range(9))
+        self._state = state
+        self._cells_views: tuple[Cell, ...] | None = None
+        self._containers: tuple[Container, ...] | None = None
+        self._rows: tuple[Container, ...] = ()
+        self._columns: tuple[Container, ...] = ()
+        self._boxes: tuple[Container, ...] = ()
+        self._history_manager: HistoryManager | None = None
 
     def __str__(self) -> str:
         return "Grid"
 
+    @property
+    def state(self) -> GridState:
+        return self._state
+
+    @property
+    def cells(self) -> tuple[Cell, ...]:
+        if self._cells_views is None:
+            self._cells_views = tuple(Cell(self._state, idx) for idx in range(81))
+        return self._cells_views
+
     @property
     def history_manager(self) -> HistoryManager:
+        if self._history_manager is None:
+            self._history_manager = HistoryManager(self._state.journal, self.filter_cells(given=False))
         return self._history_manager
 
+    @property
+    def journal(self) -> ChangeJournal:
+        return self._state.journal
+
     @property
     def is_consistent(self) -> bool:
         self._logger.info("%s: Running consistency check", self)
-        return all(cont.is_consistent for cont in chain(self._rows, self._columns, self._boxes))
+        return all(cont.is_consistent for cont in self.containers)
 
     @property
     def rows(self) -> tuple[Container, ...]:
+        if self._containers is None:
+            self._create_containers()
         return self._rows
 
     @property
     def columns(self) -> tuple[Container, ...]:
+        if self._containers is None:
+            self._create_containers()
         return self._columns
 
     @property
     def boxes(self) -> tuple[Container, ...]:
+        if self._containers is None:
+            self._create_containers()
         return self._boxes
 
+    @property
+    def containers(self) -> tuple[Container, ...]:
+        """Rows, columns and boxes in topology containers order"""
+        if self._containers is None:
+            return self._create_containers()
+        return self._containers
+
     @property
     def console_representation(self) -> str:
         result = ""
@@ -56,35 +96,53 @@ class Grid(CellsHolder):
         return result
 
     def get_column(self, cell: Cell) -> Container:
-        try:
-            return self._columns[cell.coordinates[0]]
-        except IndexError:
-            raise SudokuException(f"{self}: Illegal column index {cell.coordinates[0]} for {cell=}")
+        return self.containers[topology.COLUMNS_OFFSET + topology.COLUMN_OF[cell.idx]]
 
     def get_row(self, cell: Cell) -> Container:
-        try:
-            return self._rows[cell.coordinates[1]]
-        except IndexError:
-            raise SudokuException(f"{self}: Illegal row index {cell.coordinates[1]} for {cell=}")
+        return self.containers[topology.ROWS_OFFSET + topology.ROW_OF[cell.idx]]
 
     def get_box(self, cell: Cell) -> Container:
-        column, row = cell.coordinates
-        block_idx = 3 * (row // 3) + (column // 3)
-        try:
-            return self._boxes[block_idx]
-        except IndexError:
-            raise SudokuException(f"{self}: Illegal block index {block_idx} for {cell=}")
+        return self.containers[topology.BOXES_OFFSET + topology.BOX_OF[cell.idx]]
+
+    def get_containers(self, cell: Cell) -> tuple[Container, Container, Container]:
+        containers = self.containers
+        row, column, box = topology.CELL_CONTAINERS[cell.idx]
+        return containers[row], containers[column], containers[box]
 
     def get_neighbors(self, cell: Cell, /, **kwargs: Unpack[CellsFilter]) -> set[Cell]:
-        conts = (self.get_row(cell), self.get_column(cell), self.get_box(cell))
-        return {cont_cell for cont in conts for cont_cell in cont.filter_cells(**kwargs)} - {cell}
+        cells = self.cells
+        return set(self._filter((cells[idx] for idx in topology.PEERS[cell.idx]), **kwargs))
+
+    def get_candidate_positions(self, container: Container, candidate: int) -> int:
+        """Mask of container cells positions holding the candidate"""
+        return self._state.get_positions(container.grid_idx, candidate)
+
+    def get_candidate_cells(self, candidate: int, container: Container | None = None) -> tuple[Cell, ...]:
+        """Cells holding the candidate in the container, or in the whole grid if no container is given"""
+        if container is not None:
+            cont_cells = container.cells
+            return tuple(
+                cont_cells[pos] for pos in bitmask.to_positions(self.get_candidate_positions(container, candidate))
+            )
+        return tuple(cell for row in self.rows for cell in self.get_candidate_cells(candidate, row))
+
+    def clone(self) -> "Grid":
+        """Copy of the grid values and candidates. History is not copied"""
+        return Grid.from_state(self._state.copy())
+
+    @classmethod
+    def from_state(cls, state: GridState) -> "Grid":
+        """Grid over the state as is, cells are not validated"""
+        grid = cls.__new__(cls)
+        grid._setup(state)
+        return grid
 
     @as_complex_action
     def set_value(self, cell: Cell, value: int) -> None:
         self._logger.info("%s: Setting cell value: %s = %d", self, cell, value)
         cell.value = value
         for neighbor in self.get_neighbors(cell, has_candidate=cell.value):
-            neighbor.candidates -= {cell.value}
+            neighbor.remove_candidate(cell.value)
 
     @as_complex_action
     def reset(self) -> None:
@@ -96,28 +154,28 @@ class Grid(CellsHolder):
     def init_candidates(self) -> None:
         self._logger.info("%s: Creating candidates", self)
         for cell in self.filter_cells(solved=False):
-            cands = self._prepare_candidates(cell)
-            if not cands:
+            mask = self._prepare_candidates_mask(cell)
+            if not mask:
                 self._logger.warning("%s: No candidates found for %s", self, cell)
-            cell.candidates = cands
-
-    def _create_cells(self, field: Iterable[int | str]) -> tuple[Cell, ...]:
-        values = self._adjust_field(field)
-        return tuple(Cell(value, i % 9, i // 9) for i, value in enumerate(values))
-
-    def _create_row(self, idx: int) -> Container:
-        cells = [self.get_cell(i, idx) for i in range(9)]
-        return Container(cells, idx, ContainerType.ROW)
-
-    def _create_column(self, idx: int) -> Container:
-        cells = [self.get_cell(idx, i) for i in range(9)]
-        return Container(cells, idx, ContainerType.COLUMN)
-
-    def _create_box(self, idx: int) -> Container:
-        row = 3 * (idx % 3)
-        column = 3 * (idx // 3)
-        cells = [self.get_cell(row + j, column + i) for i in range(3) for j in range(3)]
-        return Container(cells, idx, ContainerType.BOX)
+            cell.candidates_mask = mask
+
+    def _create_containers(self) -> tuple[Container, ...]:
+        cells = self.cells
+        conts = topology.CONTAINER_CELLS
+        self._rows = tuple(
+            Container([cells[i] for i in conts[topology.ROWS_OFFSET + idx]], idx, ContainerType.ROW)
+            for idx in range(9)
+        )
+        self._columns = tuple(
+            Container([cells[i] for i in conts[topology.COLUMNS_OFFSET + idx]], idx, ContainerType.COLUMN)
+            for idx in range(9)
+        )
+        self._boxes = tuple(
+            Container([cells[i] for i in conts[topology.BOXES_OFFSET + idx]], idx, ContainerType.BOX)
+            for idx in range(9)
+        )
+        self._containers = self._rows + self._columns + self._boxes
+        return self._containers
 
     def _adjust_field(self, field: Iterable[int | str]) -> tuple[int, ...]:
         try:
@@ -126,7 +184,13 @@ class Grid(CellsHolder):
             raise SudokuException(f"{self}: Non numeric value found")
         if len(result) != 81:
             raise SudokuException(f"{self}: Unexpected cells count {len(result)}")
+        for value in result:
+            if value not in range(10):
+                raise SudokuException(f"{self}: Invalid value {value}")
         return result
 
-    def _prepare_candidates(self, cell: Cell) -> frozenset[int]:
-        return frozenset(range(1, 10)) - {neighbor.value for neighbor in self.get_neighbors(cell, solved=True)}
+    def _prepare_candidates_mask(self, cell: Cell) -> int:
+        mask = bitmask.FULL_MASK
+        for neighbor in self.get_neighbors(cell, solved=True):
+            mask &= ~bitmask.digit_bit(neighbor.value)
+        return mask
@@ -0,0 +1,94 @@
+from array import array
+from typing import Iterable
+
+from .change_journal import ChangeJournal
+from .topology import CELL_CONTAINERS, CELL_POSITIONS
+
+
+class GridState:
+    """Flat mutable grid storage indexed by cell index.
+    Cell and Container objects are lightweight views over it, so copying a grid is a buffer copy
+
+    values: cells values, 0 for unsolved cells
+    masks: cells candidates masks
+    givens: given cells values, 0 for non given cells. Immutable, shared between copies
+    positions: (container index * 9 + digit - 1) -> mask of container positions holding the candidate.
+        Kept in sync with masks on every change
+    journal: cells changes journal. Not copied
+    container_versions: container index -> count of its cells changes
+    digit_versions: digit - 1 -> count of the digit candidates changes, updated with positions.
+        Versions only grow: an unchanged version means an unchanged region
+    """
+
+    __slots__ = ("container_versions", "digit_versions", "givens", "journal", "masks", "positions", "values")
+
+    def __init__(self, values: bytearray, masks: "array[int]", givens: bytes, positions: "array[int]"):
+        self.values = values
+        self.masks = masks
+        self.givens = givens
+        self.positions = positions
+        self.journal = ChangeJournal()
+        self.container_versions = array("L", [0] * 27)
+        self.digit_versions = array("L", [0] * 9)
+
+    @classmethod
+    def from_values(cls, values: Iterable[int]) -> "GridState":
+        buffer = bytearray(values)
+        return cls(buffer, array("H", bytes(2 * len(buffer))), bytes(buffer), array("H", bytes(2 * 27 * 9)))
+
+    @classmethod
+    def from_cells(cls, values: bytes, masks: "array[int]", givens: bytes) -> "GridState":
+        """State of already validated cells, values include givens"""
+        state = cls(bytearray(values), array("H", masks), bytes(givens), array("H", bytes(2 * 27 * 9)))
+        for idx, mask in enumerate(masks):
+            if mask:
+                state._update_positions(idx, mask)
+        return state
+
+    def copy(self) -> "GridState":
+        state = GridState(self.values[:], self.masks[:], self.givens, self.positions[:])
+        state.container_versions = self.container_versions[:]
+        state.digit_versions = self.digit_versions[:]
+        return state
+
+    def get_positions(self, container_idx: int, digit: int) -> int:
+        return self.positions[container_idx * 9 + digit - 1]
+
+    def set_value(self, idx: int, value: int) -> None:
+        recording = self.journal.recording
+        if recording:
+            self.journal.record(idx, self.values[idx], self.masks[idx])
+        self.values[idx] = value
+        self._update_positions(idx, self.masks[idx])
+        self.masks[idx] = 0
+        self._update_versions(idx)
+        if recording:
+            self.journal.flush()
+
+    def set_mask(self, idx: int, mask: int) -> None:
+        recording = self.journal.recording
+        if recording:
+            self.journal.record(idx, self.values[idx], self.masks[idx])
+        changed = self.masks[idx] ^ mask
+        self._update_positions(idx, changed)
+        self.masks[idx] = mask
+        if changed:
+            self._update_versions(idx)
+        if recording:
+            self.journal.flush()
+
+    def _update_positions(self, idx: int, changed: int) -> None:
+        positions = self.positions
+        cell_positions = CELL_POSITIONS[idx]
+        while changed:
+            bit = changed & -changed
+            changed ^= bit
+            digit_offset = bit.bit_length() - 1
+            self.digit_versions[digit_offset] += 1
+            for cont, pos in cell_positions:
+                positions[cont * 9 + digit_offset] ^= 1 << pos
+
+    def _update_versions(self, idx: int) -> None:
+        container_versions = self.container_versions
+        for cont in CELL_CONTAINERS[idx]:
+            container_versions[cont] += 1
@@ -0,0 +1,66 @@
+"""Static grid topology lookup tables, built once at import.
+
+Cells are indexed as col + row * 9.
+Containers are indexed as rows 0-8, columns 9-17, boxes 18-26.
+"""
+
+from itertools import combinations
+from types import MappingProxyType
+from typing import Mapping
+
+ROWS_OFFSET = 0
+COLUMNS_OFFSET = 9
+BOXES_OFFSET = 18
+
+ROW_OF = tuple(idx // 9 for idx in range(81))
+COLUMN_OF = tuple(idx % 9 for idx in range(81))
+BOX_OF = tuple(3 * (idx // 27) + idx % 9 // 3 for idx in range(81))
+
+
+def _build_container_cells() -> tuple[tuple[int, ...], ...]:
+    rows = [tuple(row * 9 + col for col in range(9)) for row in range(9)]
+    columns = [tuple(row * 9 + col for row in range(9)) for col in range(9)]
+    boxes = [tuple(idx for idx in range(81) if BOX_OF[idx] == box) for box in range(9)]
+    return tuple(rows + columns + boxes)
+
+
+def _build_intersections() -> Mapping[tuple[int, int], tuple[int, ...]]:
+    result: dict[tuple[int, int], tuple[int, ...]] = {}
+    for box in range(BOXES_OFFSET, BOXES_OFFSET + 9):
+        for line in range(BOXES_OFFSET):
+            cells = tuple(sorted(set(CONTAINER_CELLS[box]) & set(CONTAINER_CELLS[line])))
+            if cells:
+                result[(box, line)] = result[(line, box)] = cells
+    return MappingProxyType(result)
+
+
+CONTAINER_CELLS = _build_container_cells()
+
+CELL_CONTAINERS = tuple(
+    (ROWS_OFFSET + ROW_OF[idx], COLUMNS_OFFSET + COLUMN_OF[idx], BOXES_OFFSET + BOX_OF[idx]) for idx in range(81)
+)
+
+# Cell index -> (container index, position in container) for its row, column and box
+CELL_POSITIONS = tuple(
+    tuple((cont, CONTAINER_CELLS[cont].index(idx)) for cont in CELL_CONTAINERS[idx]) for idx in range(81)
+)
+
+PEER_SETS = tuple(
+    frozenset(peer for cont in CELL_CONTAINERS[idx] for peer in CONTAINER_CELLS[cont]) - {idx} for idx in range(81)
+)
+
+PEERS = tuple(tuple(sorted(peers)) for peers in PEER_SETS)
+
+# Cell index -> peers as an 81 bit cells mask, bit idx is set for cell idx
+PEER_MASKS = tuple(sum(1 << peer for peer in peers) for peers in PEER_SETS)
+
+# Box x Row/Column shared cells. Keyed by both (box, line) and (line, box)
+INTERSECTIONS = _build_intersections()
+
+# Container index -> containers intersecting it: crossing rows and columns of a box, boxes of a line
+CROSSING_CONTAINERS = tuple(tuple(other for cont, other in sorted(INTERSECTIONS) if cont == idx) for idx in range(27))
+
+# Base lines combinations for basic fish sizes 2-4
+LINE_COMBINATIONS: Mapping[int, tuple[tuple[int, ...], ...]] = MappingProxyType(
+    {size: tuple(combinations(range(9), size)) for size in (2, 3, 4)}
+)
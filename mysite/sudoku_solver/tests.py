@@ -0,0 +1,838 @@
+import asyncio
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.migrations.state import StateApps
+from django.db.models import BinaryField
+from django.db.models.functions import Cast
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+
+from . import models, solving
+from .solution_cache import SolutionCache
+from .solver import BruteForcer, DancingLinks, StepSolver, count_solutions, has_unique_solution
+from .solver.backtracking import BacktrackingSearch
+from .solver.dancing_links import ExactCoverSearch
+from .solver.strategies import XChain
+from .solver_pool import SolverPool, SolverPoolException, SolverPoolTimeout
+from .sudoku import Grid, topology
+from .utils import board_utils
+from .utils.symmetry import SymmetryTransform, canonicalize, get_canonical_digest
+
+if TYPE_CHECKING:
+    from django.test.client import _MonkeyPatchedASGIResponse, _MonkeyPatchedWSGIResponse
+
+# Unique solution puzzle
+PUZZLE = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+SOLUTION = "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+# Puzzles stepped with an X-Chain, with a unique solution and with 97 solutions
+X_CHAIN_PUZZLES = (
+    "000000400006500030980400010009004802800060000005090000530600000190300050000045073",
+    "050200080320000600040060050030000090200800000074000015080324000002007030700600524",
+)
+# Transposes, permutes bands, stacks, rows and columns within them, relabels digits
+SYMMETRY_TRANSFORM = SymmetryTransform(
+    True, (5, 3, 4, 8, 7, 6, 0, 2, 1), (7, 6, 8, 1, 2, 0, 4, 5, 3), (0, 5, 3, 9, 1, 2, 8, 7, 4, 6)
+)
+
+
+def to_givens(data: str) -> tuple[int, ...]:
+    return tuple(0 if c == "." else int(c) for c in data)
+
+
+def is_valid_solution(givens: tuple[int, ...], values: list[int]) -> bool:
+    if any(given and given != value for given, value in zip(givens, values)):
+        return False
+    return all(sorted(values[idx] for idx in cells) == list(range(1, 10)) for cells in topology.CONTAINER_CELLS)
+
+
+class SolutionsSearchTests(SimpleTestCase):
+    searches = (BacktrackingSearch, ExactCoverSearch)
+
+    def test_unique_solution(self) -> None:
+        for search in self.searches:
+            with self.subTest(search=search.__name__):
+                self.assertEqual(search(to_givens(PUZZLE)).solutions(2), [list(to_givens(SOLUTION))])
+
+    def test_solutions_limit(self) -> None:
+        for search in self.searches:
+            for limit in (0, 1, 3):
+                with self.subTest(search=search.__name__, limit=limit):
+                    solutions = search([0] * 81).solutions(limit)
+                    self.assertEqual(len(solutions), limit)
+                    self.assertEqual(len({tuple(solution) for solution in solutions}), limit)
+                    for solution in solutions:
+                        self.assertTrue(is_valid_solution((0,) * 81, solution))
+
+    def test_conflicting_givens(self) -> None:
+        givens = [0] * 81
+        givens[0] = givens[8] = 5
+        for search in self.searches:
+            with self.subTest(search=search.__name__):
+                self.assertEqual(search(givens).solutions(2), [])
+
+    def test_contradiction(self) -> None:
+        # Cell 0 sees 1-8 in its row and 9 in its column
+        givens = [0, *range(1, 9)] + [0] * 72
+        givens[9 * 4] = 9
+        for search in self.searches:
+            with self.subTest(search=search.__name__):
+                self.assertEqual(search(givens).solutions(2), [])
+
+
+class SolversTests(SimpleTestCase):
+    def test_solve(self) -> None:
+        for solver_class in (BruteForcer, DancingLinks):
+            with self.subTest(solver=solver_class.__name__):
+                grid = Grid(PUZZLE)
+                self.assertTrue(solver_class(grid).solve())
+                self.assertEqual("".join(str(cell.value) for cell in grid.cells), SOLUTION)
+                self.assertTrue(grid.is_solved)
+
+    def test_no_solution(self) -> None:
+        givens = [0, *range(1, 9)] + [0] * 72
+        givens[9 * 4] = 9
+        for solver_class in (BruteForcer, DancingLinks):
+            with self.subTest(solver=solver_class.__name__):
+                grid = Grid(givens)
+                self.assertFalse(solver_class(grid).solve())
+                self.assertFalse(grid.is_solved)
+
+
+class CountSolutionsTests(SimpleTestCase):
+    def test_unique(self) -> None:
+        self.assertEqual(count_solutions(Grid(PUZZLE)), 1)
+        self.assertTrue(has_unique_solution(Grid(PUZZLE)))
+
+    def test_limit(self) -> None:
+        self.assertEqual(count_solutions(Grid([0] * 81), limit=1), 1)
+        self.assertEqual(count_solutions(Grid([0] * 81), limit=10), 10)
+        self.assertFalse(has_unique_solution(Grid([0] * 81)))
+
+    def test_two_solutions(self) -> None:
+        # Swapping two digits of a solution rectangle: the puzzle without these cells has two solutions
+        givens = list(to_givens(SOLUTION))
+        for idx in self._get_deadly_pattern(givens):
+            givens[idx] = 0
+        self.assertEqual(count_solutions(Grid(givens), limit=10), 2)
+
+    def test_contradiction(self) -> None:
+        givens = [0, *range(1, 9)] + [0] * 72
+        self.assertEqual(count_solutions(Grid(givens), limit=1), 1)
+        givens[9 * 4] = 9
+        self.assertEqual(count_solutions(Grid(givens), limit=10), 0)
+        self.assertEqual(count_solutions(Grid(PUZZLE), limit=0), 0)
+
+    @staticmethod
+    def _get_deadly_pattern(values: list[int]) -> tuple[int, ...]:
+        """Cells of a rectangle over two boxes holding a digits pair swapped between its rows"""
+        for row1 in range(9):
+            for row2 in range(row1 - row1 % 3, row1 - row1 % 3 + 3):
+                if row2 <= row1:
+                    continue
+                for col1 in range(9):
+                    for col2 in range(col1 - col1 % 3 + 3, 9):
+                        cells = (row1 * 9 + col1, row1 * 9 + col2, row2 * 9 + col1, row2 * 9 + col2)
+                        a, b, c, d = (values[idx] for idx in cells)
+                        if a == d and b == c:
+                            return cells
+        raise AssertionError("no deadly pattern")
+
+
+class PackedBoardTests(SimpleTestCase):
+    def _get_board(self) -> Grid:
+        """Givens, solved cells and narrowed candidates"""
+        grid = Grid(PUZZLE)
+        grid.init_candidates()
+        grid.cells[1].value = 1
+        grid.cells[2].remove_candidate(2)
+        return grid
+
+    def test_round_trip(self) -> None:
+        grid = self._get_board()
+        data = board_utils.pack_board(grid)
+        self.assertEqual(len(data), board_utils.PACKED_BOARD_SIZE)
+        self.assertEqual(board_utils.encode_board(board_utils.unpack_board(data)), board_utils.encode_board(grid))
+        encoded = board_utils.encode_board(grid)
+        self.assertEqual(board_utils.pack_encoded(encoded), data)
+        self.assertEqual(board_utils.unpack_encoded(data), encoded)
+        self.assertEqual(board_utils.parse_packed(data).encode(), encoded)
+        self.assertEqual(board_utils.unpack_givens(data), PUZZLE)
+
+    def test_invalid_packed(self) -> None:
+        data = bytearray(board_utils.pack_board(self._get_board()))
+        with self.assertRaises(board_utils.BoardParseError) as e:
+            board_utils.parse_packed(bytes(data[:-2]))
+        self.assertEqual((e.exception.cell, e.exception.offset), (0, 0))
+        # value 10, given flag without a value, value with candidates
+        for word in (10 << 9, 1 << 13, 1 << 9 | 1):
+            data[6:8] = word.to_bytes(2, "little")
+            with self.subTest(word=word), self.assertRaises(board_utils.BoardParseError) as e:
+                board_utils.parse_packed(bytes(data))
+            self.assertEqual((e.exception.cell, e.exception.offset), (3, 6))
+
+
+class PackedBoardFieldTests(TestCase):
+    def test_round_trip(self) -> None:
+        user = models.User.objects.create_user("user")
+        encoded = board_utils.encode_board(Grid(PUZZLE))
+        board = models.Board.objects.create(user=user, board=encoded)
+        board.refresh_from_db()
+        self.assertEqual(board.board, encoded)
+        packed = models.Board.objects.annotate(packed=Cast("board", BinaryField())).values_list("packed", flat=True)
+        self.assertEqual(bytes(packed.get()), board_utils.pack_encoded(encoded))
+
+
+class BoardAnalysisTests(TestCase):
+    def setUp(self) -> None:
+        user = models.User.objects.create_user("user")
+        board = models.Board(user=user, board=board_utils.encode_givens(to_givens(PUZZLE)))
+        analysis: solving.GivensAnalysis = {
+            "solution": SOLUTION,
+            "solution_count": 1,
+            "givens_count": 21,
+            "difficulty": 3,
+            "canonical_digest": get_canonical_digest(board.givens),
+        }
+        board.set_analysis(board.givens, analysis)
+        board.save()
+        self.board_id = board.id
+
+    def test_kept_for_same_givens(self) -> None:
+        board = models.Board.objects.get(id=self.board_id)
+        grid = Grid(PUZZLE)
+        grid.init_candidates()
+        board.board = board_utils.encode_board(grid)
+        board.save()
+        board = models.Board.objects.get(id=self.board_id)
+        self.assertEqual((board.solution_count, board.difficulty), (1, 3))
+        self.assertEqual(board.stored_solution, to_givens(SOLUTION))
+
+    def test_cleared_for_changed_givens(self) -> None:
+        board = models.Board.objects.get(id=self.board_id)
+        board.board = board_utils.encode_givens(to_givens("1" + PUZZLE[1:]))
+        board.save()
+        board = models.Board.objects.get(id=self.board_id)
+        self.assertEqual((board.solution, board.solution_count, board.difficulty), ("", None, None))
+        self.assertIsNone(board.canonical_digest)
+        self.assertIsNone(board.stored_solution)
+
+
+class ImportPuzzlesTests(TestCase):
+    def setUp(self) -> None:
+        self.user = models.User.objects.create_user("user")
+        self.path = Path(self.enterContext(tempfile.TemporaryDirectory())) / "puzzles.txt"
+
+    def test_dedupe(self) -> None:
+        # a saved board without a digest, its transposed copy, a new puzzle and its repetition
+        models.Board.objects.create(user=self.user, board=board_utils.encode_givens(to_givens(PUZZLE)))
+        transposed = "".join(PUZZLE[col * 9 + row] for row in range(9) for col in range(9))
+        self.path.write_text(f"{transposed}\n{X_CHAIN_PUZZLES[0]}\n{X_CHAIN_PUZZLES[0]}\n")
+        self._import("--dedupe", "--batch-size", "1")
+        boards = models.Board.objects.order_by("id")
+        self.assertEqual([board.givens for board in boards], [to_givens(PUZZLE), to_givens(X_CHAIN_PUZZLES[0])])
+        self.assertEqual(boards[0].canonical_digest, get_canonical_digest(to_givens(transposed)))
+        self.assertEqual(boards[1].description, "puzzles.txt #2")
+
+    def test_analyze(self) -> None:
+        self.path.write_text(f"{PUZZLE}\n{X_CHAIN_PUZZLES[1]}\n")
+        self._import("--analyze")
+        board = models.Board.objects.get()
+        self.assertEqual((board.givens, board.stored_solution), (to_givens(PUZZLE), to_givens(SOLUTION)))
+        self.assertEqual(board.canonical_digest, get_canonical_digest(to_givens(PUZZLE)))
+
+    def _import(self, *args: str) -> None:
+        call_command("import_puzzles", self.path, *args, "--user", "user", "--workers", "2", stdout=io.StringIO())
+
+
+class PackedBoardMigrationTests(TransactionTestCase):
+    migrate_from = ("sudoku_solver", "0002_board_analysis")
+    migrate_to = ("sudoku_solver", "0003_board_packed")
+
+    def setUp(self) -> None:
+        self._migrate([self.migrate_from])
+
+    def tearDown(self) -> None:
+        executor = MigrationExecutor(connection)
+        self._migrate(executor.loader.graph.leaf_nodes())
+
+    def test_forward_and_backward(self) -> None:
+        grid = Grid(PUZZLE)
+        grid.init_candidates()
+        encoded = board_utils.encode_board(grid)
+        apps = self._migrate([self.migrate_from])
+        user = apps.get_model("sudoku_solver", "User").objects.create(username="user")
+        board_model = apps.get_model("sudoku_solver", "Board")
+        board_model.objects.create(user=user, board=encoded)
+
+        apps = self._migrate([self.migrate_to])
+        boards = apps.get_model("sudoku_solver", "Board").objects
+        self.assertEqual(boards.get().board, encoded)
+        packed = boards.annotate(packed=Cast("board", BinaryField())).values_list("packed", flat=True).get()
+        self.assertEqual(bytes(packed), board_utils.pack_encoded(encoded))
+
+        apps = self._migrate([self.migrate_from])
+        self.assertEqual(apps.get_model("sudoku_solver", "Board").objects.get().board, encoded)
+
+    @staticmethod
+    def _migrate(targets: list[tuple[str, str]]) -> StateApps:
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        executor.loader.build_graph()
+        return executor.loader.project_state(targets).apps
+
+
+class ParseBoardTests(SimpleTestCase):
+    def setUp(self) -> None:
+        grid = Grid(PUZZLE)
+        grid.init_candidates()
+        grid.cells[1].value = 1
+        self.tokens = board_utils.encode_board(grid).split(",")
+
+    def test_parse(self) -> None:
+        data = ",".join(self.tokens)
+        parsed = board_utils.parse_board(data)
+        self.assertEqual(parsed.encode(), data)
+        self.assertEqual(board_utils.encode_board(parsed.to_grid()), data)
+        self.assertEqual(bytes(parsed.givens), bytes(to_givens(PUZZLE)))
+        self.assertEqual(parsed.values[1], 1)
+        self.assertEqual(parsed.givens[1], 0)
+
+    def test_invalid_cell(self) -> None:
+        for token in ("+0", "-10", "+", "512", "007", "", "x", "1.5", "٣"):
+            tokens = self.tokens[:]
+            tokens[5] = token
+            with self.subTest(token=token), self.assertRaises(board_utils.BoardParseError) as e:
+                board_utils.parse_board(",".join(tokens))
+            self.assertEqual((e.exception.cell, e.exception.offset), (5, len(",".join(tokens[:5])) + 1))
+
+    def test_cells_count(self) -> None:
+        with self.assertRaises(board_utils.BoardParseError) as e:
+            board_utils.parse_board(",".join(self.tokens[:80]))
+        self.assertEqual((e.exception.cell, e.exception.offset), (80, len(",".join(self.tokens[:80]))))
+        with self.assertRaises(board_utils.BoardParseError) as e:
+            board_utils.parse_board(",".join([*self.tokens, "0"]))
+        self.assertEqual((e.exception.cell, e.exception.offset), (81, len(",".join(self.tokens)) + 1))
+
+    def test_parse_puzzle(self) -> None:
+        self.assertEqual(board_utils.parse_puzzle(PUZZLE), to_givens(PUZZLE))
+        self.assertEqual(board_utils.parse_puzzle(PUZZLE.replace("0", ".")), to_givens(PUZZLE))
+        with self.assertRaises(board_utils.BoardParseError) as e:
+            board_utils.parse_puzzle(PUZZLE[:7] + "x" + PUZZLE[8:])
+        self.assertEqual((e.exception.cell, e.exception.offset), (7, 7))
+        with self.assertRaises(board_utils.BoardParseError) as e:
+            board_utils.parse_puzzle(PUZZLE[:80])
+        self.assertEqual((e.exception.cell, e.exception.offset), (80, 80))
+
+
+class StepSolverTests(SimpleTestCase):
+    def test_keeps_solutions(self) -> None:
+        """Every step keeps the digits of each cell in all the solutions, as a value or candidates"""
+        for puzzle in (PUZZLE, *X_CHAIN_PUZZLES):
+            solutions = ExactCoverSearch(to_givens(puzzle)).solutions(100)
+            digits = [set(cell_digits) for cell_digits in zip(*solutions)]
+            for strict in (True, False):
+                with self.subTest(puzzle=puzzle, strict=strict):
+                    self._check_steps(puzzle, digits, strict)
+
+    def test_x_chain(self) -> None:
+        for puzzle in X_CHAIN_PUZZLES:
+            with self.subTest(puzzle=puzzle):
+                grid = Grid(puzzle)
+                grid.init_candidates()
+                solver = StepSolver(grid)
+                strategies = set()
+                while solver.solve():
+                    strategies.add(type(solver.last_strategy))
+                self.assertIn(XChain, strategies)
+
+    def test_track_changes(self) -> None:
+        """Skipping unchanged regions makes the same steps as full scans, changes made between steps included"""
+        for puzzle in X_CHAIN_PUZZLES:
+            solutions = ExactCoverSearch(to_givens(puzzle)).solutions(100)
+            digits = [set(cell_digits) for cell_digits in zip(*solutions)]
+            with self.subTest(puzzle=puzzle):
+                grids = [Grid(puzzle), Grid(puzzle)]
+                solvers = []
+                for grid, track_changes in zip(grids, (True, False)):
+                    grid.init_candidates()
+                    solvers.append(StepSolver(grid, track_changes=track_changes))
+                steps = 0
+                while solvers[0].solve():
+                    self.assertTrue(solvers[1].solve())
+                    self.assertEqual(str(solvers[0].last_strategy), str(solvers[1].last_strategy))
+                    self.assertEqual(grids[0].state.masks, grids[1].state.masks)
+                    self.assertEqual(grids[0].state.values, grids[1].state.values)
+                    steps += 1
+                    if steps == 1:
+                        # a change made outside of the strategies: a candidate of no solution eliminated
+                        idx, digit = next(
+                            (cell.idx, digit)
+                            for cell in grids[0].filter_cells(solved=False)
+                            for digit in cell.candidates
+                            if digit not in digits[cell.idx]
+                        )
+                        for grid in grids:
+                            grid.cells[idx].remove_candidate(digit)
+                self.assertFalse(solvers[1].solve())
+                self.assertGreater(steps, 1)
+                self.assertGreater(sum(strategy.skipped for strategy in solvers[0].strategies), 0)
+                self.assertEqual(sum(strategy.skipped for strategy in solvers[1].strategies), 0)
+
+    def _check_steps(self, puzzle: str, digits: list[set[int]], strict: bool) -> None:
+        grid = Grid(puzzle)
+        grid.init_candidates()
+        solver = StepSolver(grid, strict=strict)
+        while solver.solve():
+            self.assertIsNotNone(solver.last_strategy)
+            for cell, cell_digits in zip(grid.cells, digits):
+                if cell.value:
+                    self.assertEqual({cell.value}, cell_digits, f"{solver.last_strategy} set cell {cell}")
+                else:
+                    self.assertLessEqual(cell_digits, cell.candidates, f"{solver.last_strategy} eliminated in {cell}")
+        self.assertIsNone(solver.last_strategy)
+
+
+class SolveEngineTests(TestCase):
+    def setUp(self) -> None:
+        self.client.force_login(models.User.objects.create_user("user"))
+
+    def test_invalid_engine(self) -> None:
+        for url, engines in (
+            ("/sudoku-solver/solve/", ["backtracking", "dlx"]),
+            ("/sudoku-solver/solve-step/", ["step"]),
+        ):
+            for engine in ("unknown", ["dlx"]):
+                with self.subTest(url=url, engine=engine):
+                    response = self.client.post(
+                        url, {"engine": engine, "board": PUZZLE}, content_type="application/json"
+                    )
+                    self.assertEqual(response.status_code, 400)
+                    self.assertEqual(response.json(), {"error": f"engine is invalid, expected one of: {engines}"})
+
+
+class HistoryManagerTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.grid = Grid(X_CHAIN_PUZZLES[0])
+        self.grid.init_candidates()
+        self.history = self.grid.history_manager
+        self.history.enable_history()
+        self.changes = 0
+        self.history.add_on_change_handler(self._count_change)
+
+    def test_value_round_trip(self) -> None:
+        before = self._get_states()
+        # placed value and neighbors eliminations are one action
+        self.grid.set_value(self.grid.cells[34], 6)
+        after = self._get_states()
+        self.assertNotEqual(after, before)
+        self.history.undo()
+        self.assertEqual(self._get_states(), before)
+        self.assertEqual((self.history.is_undo_possible, self.history.is_redo_possible), (False, True))
+        self.history.redo()
+        self.assertEqual(self._get_states(), after)
+        self.assertEqual((self.history.is_undo_possible, self.history.is_redo_possible), (True, False))
+        self.assertEqual(self.changes, 3)
+
+    def test_candidates_round_trip(self) -> None:
+        cell = next(cell for cell in self.grid.filter_cells(solved=False) if cell.candidates_count > 2)
+        first, second = sorted(cell.candidates)[:2]
+        states = [self._get_states()]
+        for candidate in (first, second):
+            cell.remove_candidate(candidate)
+            states.append(self._get_states())
+        self.history.undo()
+        self.assertEqual(self._get_states(), states[1])
+        self.history.undo()
+        self.assertEqual(self._get_states(), states[0])
+        self.history.redo()
+        self.history.redo()
+        self.assertEqual(self._get_states(), states[2])
+        self.history.undo()
+        # a new action drops the redo history
+        cell.value = second
+        self.assertFalse(self.history.is_redo_possible)
+        self.history.undo()
+        self.assertEqual(self._get_states(), states[1])
+
+    def test_reverted_cells_dropped(self) -> None:
+        cell, other = [cell for cell in self.grid.filter_cells(solved=False)][:2]
+        mask = cell.candidates_mask
+        journal = self.grid.journal
+        journal.begin()
+        cell.remove_candidate(min(cell.candidates))
+        cell.candidates_mask = mask
+        journal.end()
+        self.assertFalse(self.history.is_undo_possible)
+        self.assertEqual(self.changes, 0)
+
+        before = self._get_states()
+        journal.begin()
+        cell.remove_candidate(min(cell.candidates))
+        other.remove_candidate(min(other.candidates))
+        cell.candidates_mask = mask
+        journal.end()
+        self.assertEqual(self.changes, 1)
+        self.history.undo()
+        self.assertEqual(self._get_states(), before)
+        self.history.redo()
+        self.assertEqual(cell.candidates_mask, mask)
+        self.assertFalse(self.history.is_redo_possible)
+
+    def _get_states(self) -> list[tuple[int, int]]:
+        return [cell.get_state() for cell in self.grid.cells]
+
+    def _count_change(self) -> None:
+        self.changes += 1
+
+
+class SolverPoolTests(SimpleTestCase):
+    """Tasks are builtins: workers are spawned without Django set up"""
+
+    def setUp(self) -> None:
+        self.pool = SolverPool(2, max_tasks=3)
+        self.addCleanup(self.pool.shutdown)
+        # timed out arun tasks log after the awaiting caller got the timeout
+        logger = logging.getLogger("sudoku_solver.solver_pool")
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(logging.ERROR)
+
+    def test_run(self) -> None:
+        self.assertEqual(self.pool.run(5, divmod, 7, 2), (3, 1))
+        self.assertNotEqual(self.pool.run(5, os.getpid), os.getpid())
+
+    def test_timeout(self) -> None:
+        started = time.monotonic()
+        with self.assertRaises(SolverPoolTimeout), self.assertLogs("sudoku_solver.solver_pool", "WARNING"):
+            self.pool.run(0.2, time.sleep, 5)
+        self.assertLess(time.monotonic() - started, 1)
+        # the killed worker is replaced
+        self.assertEqual(len(self.pool.run_all(5, os.getpid)), 2)
+
+    def test_recycle(self) -> None:
+        pool = SolverPool(1, max_tasks=2)
+        self.addCleanup(pool.shutdown)
+        pid = pool.run(5, os.getpid)
+        with self.assertRaises(SolverPoolException), self.assertLogs("sudoku_solver.solver_pool", "WARNING"):
+            pool.run(5, int, "x")
+        recycled_pid = pool.run(5, os.getpid)
+        self.assertNotEqual(recycled_pid, pid)
+        # max_tasks reached
+        self.assertEqual(pool.run(5, os.getpid), recycled_pid)
+        self.assertNotEqual(pool.run(5, os.getpid), recycled_pid)
+
+    def test_map(self) -> None:
+        items = list(range(7))
+        self.assertEqual(self.pool.map(5, partial(sorted, reverse=True), items), [3, 2, 1, 0, 6, 5, 4])
+        self.assertEqual(self.pool.map(5, list, []), [])
+        # items of failed chunks are None
+        with self.assertLogs("sudoku_solver.solver_pool", "WARNING"):
+            result = self.pool.map(5, partial(sorted, key=int), ["3", "1", "x", "4"])
+        self.assertEqual(result, ["1", "3", None, None])
+
+    def test_arun_deadline(self) -> None:
+        async def run() -> tuple[object, object]:
+            return await asyncio.gather(
+                self.pool.arun(5, divmod, 7, 2),
+                self.pool.arun(0.2, time.sleep, 5),
+                return_exceptions=True,
+            )
+
+        started = time.monotonic()
+        result, error = asyncio.run(run())
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(result, (3, 1))
+        self.assertIsInstance(error, SolverPoolTimeout)
+
+    def test_arun_queue_wait(self) -> None:
+        """The arun deadline includes the wait for an idle worker"""
+        pool = SolverPool(1)
+        self.addCleanup(pool.shutdown)
+        pool.run(5, os.getpid)
+
+        async def run() -> tuple[object, object]:
+            return await asyncio.gather(
+                pool.arun(2, time.sleep, 0.4),
+                pool.arun(0.2, os.getpid),
+                return_exceptions=True,
+            )
+
+        result, error = asyncio.run(run())
+        self.assertIsNone(result)
+        self.assertIsInstance(error, SolverPoolTimeout)
+
+
+class SolutionCacheTests(SimpleTestCase):
+    def setUp(self) -> None:
+        caches["default"].clear()
+        self.cache = SolutionCache(2)
+        self.givens = to_givens(PUZZLE)
+        self.solution = to_givens(SOLUTION)
+
+    def test_local_tier(self) -> None:
+        self.assertIsNone(self.cache.get(self.givens, "dlx"))
+        self.cache.set(self.givens, "dlx", self.solution)
+        self.assertEqual(self.cache.get(self.givens, "dlx"), self.solution)
+        self.assertIsNone(self.cache.get(self.givens, "backtracking"))
+        self.cache.set(self.givens, "backtracking", self.solution, shared_hit=True)
+        # least recently used entry is evicted
+        self.cache.set(to_givens(X_CHAIN_PUZZLES[1]), "dlx", ())
+        self.assertIsNone(self.cache.get(self.givens, "dlx"))
+        self.assertEqual(self.cache.get(to_givens(X_CHAIN_PUZZLES[1]), "dlx"), ())
+        self.assertEqual(self.cache.stats, {"local_hits": 2, "shared_hits": 1, "misses": 2, "size": 2})
+        self.cache.clear()
+        self.assertEqual(self.cache.stats, {"local_hits": 0, "shared_hits": 0, "misses": 0, "size": 0})
+
+    def test_shared_tier_symmetric_copy(self) -> None:
+        canonical_givens, transform = canonicalize(self.givens)
+        self.cache.set_shared("dlx", self.solution, canonical_givens, transform)
+        stored = caches["default"].get(SolutionCache.make_key(canonical_givens, "dlx"))
+        self.assertEqual(stored, transform.apply(self.solution))
+
+        copy_givens, copy_transform = canonicalize(SYMMETRY_TRANSFORM.apply(self.givens))
+        self.assertEqual(copy_givens, canonical_givens)
+        solution = self.cache.get_shared("dlx", copy_givens, copy_transform)
+        self.assertEqual(solution, SYMMETRY_TRANSFORM.apply(self.solution))
+        self.assertEqual(SYMMETRY_TRANSFORM.revert(solution or ()), self.solution)
+        self.assertIsNone(self.cache.get_shared("backtracking", copy_givens, copy_transform))
+        # shared tier lookups aren't counted, set counts them
+        self.assertEqual(self.cache.stats, {"local_hits": 0, "shared_hits": 0, "misses": 0, "size": 0})
+
+    def test_shared_tier_no_solution(self) -> None:
+        givens = to_givens("11" + PUZZLE[2:])
+        canonical_givens, transform = canonicalize(givens)
+        self.cache.set_shared("dlx", (), canonical_givens, transform)
+        self.assertEqual(self.cache.get_shared("dlx", canonical_givens, transform), ())
+
+    def test_solution_result(self) -> None:
+        grid = Grid(PUZZLE)
+        self.assertTrue(BruteForcer(grid).solve())
+        result = solving.get_solution_result(self.givens, self.solution)
+        self.assertEqual(result, {"status": "solved", "result": board_utils.encode_board(grid)})
+        packed = solving.get_solution_result(self.givens, self.solution, packed=True)
+        self.assertEqual(solving.decode_packed(packed["result"]), board_utils.pack_board(grid))
+        self.assertEqual(solving.get_solution_result(self.givens, ())["status"], "unsolved")
+
+
+class CanonicalizeTests(SimpleTestCase):
+    identity = (range(9), range(9), range(10))
+    transforms = {
+        "transpose": SymmetryTransform(True, *identity),
+        "bands": SymmetryTransform(False, (6, 7, 8, 0, 1, 2, 3, 4, 5), range(9), range(10)),
+        "stacks": SymmetryTransform(False, range(9), (3, 4, 5, 6, 7, 8, 0, 1, 2), range(10)),
+        "rows": SymmetryTransform(False, (2, 0, 1, 4, 5, 3, 8, 7, 6), range(9), range(10)),
+        "columns": SymmetryTransform(False, range(9), (1, 2, 0, 3, 5, 4, 7, 6, 8), range(10)),
+        "digits": SymmetryTransform(False, range(9), range(9), (0, 9, 8, 7, 6, 5, 4, 3, 2, 1)),
+        "all": SYMMETRY_TRANSFORM,
+    }
+
+    def test_invariance(self) -> None:
+        for puzzle in (PUZZLE, *X_CHAIN_PUZZLES):
+            givens = to_givens(puzzle)
+            canonical_givens, transform = canonicalize(givens)
+            self.assertEqual(transform.apply(givens), canonical_givens)
+            self.assertEqual(transform.revert(canonical_givens), givens)
+            for name, symmetry in self.transforms.items():
+                with self.subTest(puzzle=puzzle, transform=name):
+                    copy = symmetry.apply(givens)
+                    self.assertNotEqual(copy, givens)
+                    copy_canonical_givens, copy_transform = canonicalize(copy)
+                    self.assertEqual(copy_canonical_givens, canonical_givens)
+                    self.assertEqual(copy_transform.revert(copy_canonical_givens), copy)
+                    self.assertEqual(get_canonical_digest(copy), get_canonical_digest(givens))
+
+    def test_solution_transform(self) -> None:
+        givens, solution = to_givens(PUZZLE), to_givens(SOLUTION)
+        canonical_givens, transform = canonicalize(SYMMETRY_TRANSFORM.apply(givens))
+        canonical_solution = transform.apply(SYMMETRY_TRANSFORM.apply(solution))
+        self.assertTrue(is_valid_solution(canonical_givens, list(canonical_solution)))
+        self.assertEqual(SYMMETRY_TRANSFORM.revert(transform.revert(canonical_solution)), solution)
+
+    def test_different_puzzles(self) -> None:
+        self.assertNotEqual(
+            get_canonical_digest(to_givens(PUZZLE)), get_canonical_digest(to_givens(X_CHAIN_PUZZLES[0]))
+        )
+
+
+@override_settings(SOLVER_POOL_WORKERS=2, SOLVE_BATCH_MAX_SIZE=3)
+class SolveViewsTests(TestCase):
+    def setUp(self) -> None:
+        self.user = models.User.objects.create_user("user")
+        self.client.force_login(self.user)
+        self.board = board_utils.encode_givens(to_givens(PUZZLE))
+        grid = Grid(PUZZLE)
+        BruteForcer(grid).solve()
+        self.solved = board_utils.encode_board(grid)
+
+    def test_login_required(self) -> None:
+        self.client.logout()
+        for url in ("/sudoku-solver/solve/", "/sudoku-solver/solve-batch/", "/sudoku-solver/check-unique/"):
+            with self.subTest(url=url):
+                response = self._post(url, {"board": self.board})
+                self.assertEqual(response.status_code, 302)
+                self.assertTrue(response["Location"].startswith("/sudoku-solver/login/"))
+
+    def test_solve(self) -> None:
+        for engine in ("backtracking", "dlx"):
+            with self.subTest(engine=engine):
+                response = self._post("/sudoku-solver/solve/", {"board": self.board, "engine": engine})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), {"result": self.solved})
+        response = self._post(
+            "/sudoku-solver/solve/", {"board": board_utils.encode_givens(to_givens("11" + PUZZLE[2:]))}
+        )
+        self.assertEqual(response.json(), {"reason": "No solution found"})
+
+    def test_solve_stored_solution(self) -> None:
+        board = models.Board(user=self.user, board=self.board)
+        board.set_analysis(board.givens, solving.analyze_givens(board.givens))
+        board.save()
+        response = self._post(f"/sudoku-solver/board/{board.id}/solve/", {"board": self.board})
+        self.assertEqual(response.json(), {"result": self.solved})
+
+    def test_solve_invalid(self) -> None:
+        for data, error in (
+            ({}, "board is required"),
+            ({"board": self.board, "format": "xml"}, "format is invalid, expected one of: ['text', 'packed']"),
+            ({"board": "1,2"}, None),
+        ):
+            with self.subTest(data=data):
+                response = self._post("/sudoku-solver/solve/", data)
+                self.assertEqual(response.status_code, 400)
+                if error is not None:
+                    self.assertEqual(response.json(), {"error": error})
+        response = self.client.post("/sudoku-solver/solve/", "{", content_type="application/json")
+        self.assertEqual((response.status_code, response.json()), (400, {"error": "Invalid JSON"}))
+
+    def test_solve_batch(self) -> None:
+        response = self._post("/sudoku-solver/solve-batch/", {"boards": [self.board, "1,2", self.board]})
+        self.assertEqual(response.status_code, 200)
+        statuses = [result["status"] for result in response.json()["results"]]
+        self.assertEqual(statuses, ["solved", "invalid", "solved"])
+        self.assertEqual(response.json()["results"][2]["result"], self.solved)
+
+    def test_solve_batch_invalid(self) -> None:
+        for data, error in (
+            ({"boards": []}, "boards list is required"),
+            ({"boards": self.board}, "boards list is required"),
+            ({"boards": [self.board] * 4}, "boards count exceeds 3"),
+            (
+                {"boards": [self.board], "engine": "step"},
+                "engine is invalid, expected one of: ['backtracking', 'dlx']",
+            ),
+        ):
+            with self.subTest(data=data):
+                response = self._post("/sudoku-solver/solve-batch/", data)
+                self.assertEqual((response.status_code, response.json()), (400, {"error": error}))
+
+    def test_check_unique(self) -> None:
+        for puzzle, limit, expected in (
+            (PUZZLE, 2, {"solutions": 1, "unique": True, "limit_reached": False}),
+            (X_CHAIN_PUZZLES[1], 2, {"solutions": 2, "unique": False, "limit_reached": True}),
+            (X_CHAIN_PUZZLES[1], 100, {"solutions": 97, "unique": False, "limit_reached": False}),
+        ):
+            with self.subTest(puzzle=puzzle, limit=limit):
+                data = {"board": board_utils.encode_givens(to_givens(puzzle)), "limit": limit}
+                response = self._post("/sudoku-solver/check-unique/", data)
+                self.assertEqual((response.status_code, response.json()), (200, expected))
+
+    def test_check_unique_invalid(self) -> None:
+        for data in (
+            {},
+            {"board": 1},
+            {"board": "1,2"},
+            *({"board": self.board, "limit": limit} for limit in (0, 101, True)),
+        ):
+            with self.subTest(data=data):
+                self.assertEqual(self._post("/sudoku-solver/check-unique/", data).status_code, 400)
+
+    def test_hint(self) -> None:
+        grid = Grid(X_CHAIN_PUZZLES[0])
+        grid.init_candidates()
+        response = self._post("/sudoku-solver/hint/", {"board": board_utils.encode_board(grid)})
+        self.assertEqual(response.status_code, 200)
+        hint = response.json()["hint"]
+        self.assertEqual((hint["strategy"], hint["placements"]), ("Naked single", [[34, 6]]))
+        self.assertEqual(hint["cells"], [7, 27, 28, 34, 51, 52, 53])
+        response = self._post("/sudoku-solver/hint/", {"board": self.solved})
+        self.assertEqual(response.json(), {"reason": "No hint found"})
+
+    def test_hint_invalid(self) -> None:
+        for data, error in (
+            ({}, "board is required"),
+            ({"board": 1}, "board is invalid"),
+            ({"board": "bad", "format": "packed"}, "board is invalid"),
+        ):
+            with self.subTest(data=data):
+                response = self._post("/sudoku-solver/hint/", data)
+                self.assertEqual((response.status_code, response.json()), (400, {"error": error}))
+
+    def test_solver_profiling_staff_only(self) -> None:
+        self.assertEqual(self.client.get("/sudoku-solver/profiling/").status_code, 403)
+        self.assertEqual(self._post("/sudoku-solver/profiling/", {"action": "reset"}).status_code, 403)
+        self.client.logout()
+        self.assertEqual(self.client.get("/sudoku-solver/profiling/").status_code, 302)
+
+    def test_solver_profiling(self) -> None:
+        self.user.is_staff = True
+        self.user.save()
+        response = self._post("/sudoku-solver/profiling/", {"action": "reset"})
+        self.assertEqual(response.json(), {"action": "reset", "workers": 2})
+        response = self.client.get("/sudoku-solver/profiling/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()["profiles"]), {"solvers", "strategies"})
+        response = self._post("/sudoku-solver/profiling/", {"action": "start"})
+        self.assertEqual(response.status_code, 400)
+
+    def _post(self, url: str, data: object) -> "_MonkeyPatchedWSGIResponse":
+        return self.client.post(url, data, content_type="application/json")
+
+
+class ExportBoardsTests(TestCase):
+    def setUp(self) -> None:
+        self.user = models.User.objects.create_user("user")
+        other = models.User.objects.create_user("other")
+        self.boards = [
+            models.Board.objects.create(
+                user=user, board=board_utils.encode_givens(to_givens(puzzle)), description=puzzle
+            )
+            for user, puzzle in ((self.user, PUZZLE), (other, PUZZLE), (self.user, X_CHAIN_PUZZLES[0]))
+        ]
+
+    async def test_ndjson(self) -> None:
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get("/sudoku-solver/boards/export/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in (await self._get_body(response)).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [self.boards[0].id, self.boards[2].id])
+        self.assertEqual([row["givens"] for row in rows], [PUZZLE, X_CHAIN_PUZZLES[0]])
+        self.assertEqual(rows[0]["board"], self.boards[0].board)
+        self.assertEqual(rows[0]["description"], PUZZLE)
+
+    async def test_lines(self) -> None:
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get("/sudoku-solver/boards/export/", {"format": "lines"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(await self._get_body(response), f"{PUZZLE}\n{X_CHAIN_PUZZLES[0]}\n")
+
+    async def test_invalid(self) -> None:
+        response = await self.async_client.get("/sudoku-solver/boards/export/")
+        self.assertEqual(response.status_code, 302)
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get("/sudoku-solver/boards/export/", {"format": "csv"})
+        self.assertEqual(response.status_code, 400)
+
+    @staticmethod
+    async def _get_body(response: "_MonkeyPatchedASGIResponse") -> str:
+        return b"".join([chunk async for chunk in response.streaming_content]).decode("ascii")
@@ -11,6 +11,7 @@ urlpatterns = [
     path("signup/", views.SignUpView.as_view(), name="signup"),
     path("change-password/", views.ChangePasswordView.as_view(), name="change-password"),
     path("boards/", views.BoardList.as_view(), name="board-list"),
+    path("boards/export/", views.export_boards, name="export-boards"),
     path("boards/create", views.BoardCreate.as_view(), name="create-board"),
     path("board/<int:board_id>/", views.BoardDetail.as_view(), name="board-detail"),
     path("board/<int:board_id>/delete/", views.BoardDelete.as_view(), name="delete"),
@@ -18,6 +19,14 @@ urlpatterns = [
     path("board/<int:board_id>/update-partial/", views.update_board, name="update-partial"),
     path("solve/", views.solve, name="solve"),
     path("board/<int:board_id>/solve/", views.solve, name="solve"),
+    path("solve-batch/", views.solve_batch, name="solve-batch"),
+    path("check-unique/", views.check_unique, name="check-unique"),
+    path("board/<int:board_id>/check-unique/", views.check_unique, name="check-unique"),
     path("solve-step/", views.solve_step, name="solve-step"),
     path("board/<int:board_id>/solve-step/", views.solve_step, name="solve-step"),
+    path("hint/", views.hint, name="hint"),
+    path("board/<int:board_id>/hint/", views.hint, name="hint"),
+    path("profiling/", views.solver_profiling, name="solver-profiling"),
+    path("solve-logically/", views.solve_logically, name="solve-logically"),
+    path("board/<int:board_id>/solve-logically/", views.solve_logically, name="solve-logically"),
 ]
@@ -1,24 +1,148 @@
-import re
+import struct
+from array import array
+from typing import Sequence
 
 from .. import sudoku
 
+# packed board: 81 little endian 16 bit cells, candidates mask | value << 9 | given flag
+PACKED_BOARD_SIZE = 162
+_PACKED_CELLS = struct.Struct("<81H")
+_VALUE_SHIFT = 9
+_GIVEN_FLAG = 1 << 13
+_MASK = (1 << _VALUE_SHIFT) - 1
+
+
+class BoardParseError(ValueError):
+    """Invalid board data. cell: index of the first invalid cell, offset: its position in the data"""
+
+    def __init__(self, message: str, cell: int, offset: int):
+        super().__init__(f"cell {cell} at offset {offset}: {message}")
+        self.cell = cell
+        self.offset = offset
+
+
+class ParsedBoard:
+    """Validated board cells by index: values (givens included), givens and candidates masks.
+    A Grid is built only on to_grid
+    """
+
+    __slots__ = ("givens", "masks", "values")
+
+    def __init__(self, values: bytes, givens: bytes, masks: "array[int]"):
+        self.values = values
+        self.givens = givens
+        self.masks = masks
+
+    def to_grid(self) -> sudoku.Grid:
+        return sudoku.Grid.from_state(sudoku.GridState.from_cells(self.values, self.masks, self.givens))
+
+    def encode(self) -> str:
+        return ",".join(
+            f"{'-' if given else '+'}{value}" if value else str(mask)
+            for value, given, mask in zip(self.values, self.givens, self.masks)
+        )
+
+    def pack(self) -> bytes:
+        return _PACKED_CELLS.pack(
+            *(
+                value << _VALUE_SHIFT | (_GIVEN_FLAG if given else 0) | mask
+                for value, given, mask in zip(self.values, self.givens, self.masks)
+            )
+        )
+
+
+def parse_board(data: str) -> ParsedBoard:
+    """Validate and decode the comma separated encoding in one walk over its cells.
+    Cells: -d given, +d solved, 0-511 candidates mask. Raises BoardParseError
+    """
+    tokens = data.split(",")
+    if len(tokens) != 81:
+        cell = min(len(tokens), 81)
+        offset = sum(len(token) + 1 for token in tokens[:cell]) - (cell < 81)
+        raise BoardParseError(f"expected 81 cells, got {len(tokens)}", cell, offset)
+    values = bytearray(81)
+    givens = bytearray(81)
+    masks = array("H", bytes(162))
+    offset = 0
+    for cell, token in enumerate(tokens):
+        sign = token[:1]
+        if sign == "-" or sign == "+":
+            if len(token) != 2 or not "1" <= token[1] <= "9":
+                raise BoardParseError(f"invalid value {token!r}", cell, offset)
+            values[cell] = value = ord(token[1]) - 48
+            if sign == "-":
+                givens[cell] = value
+        elif (
+            0 < len(token) <= 3
+            and token.isascii()
+            and token.isdigit()
+            and (token == "0" or sign != "0")
+            and int(token) <= _MASK
+        ):
+            masks[cell] = int(token)
+        else:
+            raise BoardParseError(f"invalid candidates mask {token!r}", cell, offset)
+        offset += len(token) + 1
+    return ParsedBoard(bytes(values), bytes(givens), masks)
+
+
+def parse_puzzle(data: str) -> tuple[int, ...]:
+    """Givens of an 81 characters puzzle line: digits, '.' or '0' for empty cells. Raises BoardParseError"""
+    if len(data) != 81:
+        raise BoardParseError(f"expected 81 cells, got {len(data)}", min(len(data), 81), min(len(data), 81))
+    givens = []
+    for cell, c in enumerate(data):
+        if c == ".":
+            givens.append(0)
+        elif "0" <= c <= "9":
+            givens.append(ord(c) - 48)
+        else:
+            raise BoardParseError(f"invalid cell {c!r}", cell, cell)
+    return tuple(givens)
+
+
+def parse_packed(data: bytes) -> ParsedBoard:
+    """Validate and decode the packed encoding. Raises BoardParseError"""
+    if len(data) != PACKED_BOARD_SIZE:
+        raise BoardParseError(f"expected {PACKED_BOARD_SIZE} bytes, got {len(data)}", 0, 0)
+    values = bytearray(81)
+    givens = bytearray(81)
+    masks = array("H", bytes(162))
+    for cell, word in enumerate(_PACKED_CELLS.unpack(data)):
+        value = word >> _VALUE_SHIFT & 0xF
+        if word >> 14 or value > 9 or (value and word & _MASK) or (word & _GIVEN_FLAG and not value):
+            raise BoardParseError(f"invalid cell {word:#06x}", cell, cell * 2)
+        values[cell] = value
+        if word & _GIVEN_FLAG:
+            givens[cell] = value
+        masks[cell] = word & _MASK
+    return ParsedBoard(bytes(values), bytes(givens), masks)
+
+
+def parse_board_data(data: str | bytes) -> ParsedBoard:
+    """Comma separated or packed board. Raises BoardParseError"""
+    return parse_packed(data) if isinstance(data, bytes) else parse_board(data)
+
 
 def decode_board(data: str) -> sudoku.Grid:
-    field = data.split(",")
-    grid = sudoku.Grid(c[1:] if c.startswith("-") else "." for c in field)
-    for c, cell in zip(field, grid.cells):
-        if c.startswith("+"):
-            cell.value = int(c[1:])
-        elif c != "0" and c.isdigit():
-            num = int(c)
-            cell.candidates = frozenset(i + 1 for i in range(9) if (num >> i) & 1)
-    return grid
+    return parse_board(data).to_grid()
+
+
+def decode_givens(data: str) -> tuple[int, ...]:
+    """Givens of a valid encoding, without validation"""
+    return tuple(int(c[1:]) if c.startswith("-") else 0 for c in data.split(","))
+
+
+def encode_givens(givens: Sequence[int]) -> str:
+    return ",".join(f"-{value}" if value else "0" for value in givens)
 
 
 def is_valid_encoding(data: str) -> bool:
-    number = r"(?:-?[1-9]|0|\+?[1-9]|[1-9]\d|[1-4]\d{2}|5(?:0\d|1[0-1]))"
-    pattern = rf"^{number}(?:,{number}){{80}}$"
-    return bool(re.match(pattern, data))
+    try:
+        parse_board(data)
+    except BoardParseError:
+        return False
+    return True
 
 
 def encode_board(grid: sudoku.Grid) -> str:
@@ -29,4 +153,73 @@ def encode_cell(cell: sudoku.Cell) -> str:
     if cell.value:
         return f"{'-' if cell.is_given else '+'}{cell.value}"
     else:
-        return str(sum(1 << (cand - 1) for cand in cell.candidates))
+        return str(cell.candidates_mask)
+
+
+def decode_board_data_values(data: str | bytes) -> tuple[int, ...]:
+    """Cells values, givens included"""
+    if isinstance(data, bytes):
+        return tuple(word >> _VALUE_SHIFT & 0xF for word in _PACKED_CELLS.unpack(data))
+    return tuple(int(c[1:]) if c[0] in "+-" else 0 for c in data.split(","))
+
+
+def pack_board(grid: sudoku.Grid) -> bytes:
+    return _PACKED_CELLS.pack(*map(_pack_cell, grid.cells))
+
+
+def unpack_board(data: bytes) -> sudoku.Grid:
+    return parse_packed(data).to_grid()
+
+
+def pack_values(givens: Sequence[int], values: Sequence[int]) -> bytes:
+    """Packed board of solved cells, givens cells are flagged"""
+    return _PACKED_CELLS.pack(
+        *(value << _VALUE_SHIFT | (_GIVEN_FLAG if given else 0) for given, value in zip(givens, values))
+    )
+
+
+def pack_encoded(data: str) -> bytes:
+    """Comma separated board encoding to the packed one"""
+    return _PACKED_CELLS.pack(*map(_pack_encoded_cell, data.split(",")))
+
+
+def unpack_encoded(data: bytes) -> str:
+    """Packed board to the comma separated encoding"""
+    return ",".join(map(_unpack_encoded_cell, _PACKED_CELLS.unpack(data)))
+
+
+def unpack_givens(data: bytes) -> str:
+    """Packed board givens as an 81 digits string, 0 for other cells"""
+    return "".join(
+        chr(48 + (word >> _VALUE_SHIFT & 0xF)) if word & _GIVEN_FLAG else "0" for word in _PACKED_CELLS.unpack(data)
+    )
+
+
+def is_valid_packing(data: bytes) -> bool:
+    try:
+        parse_packed(data)
+    except BoardParseError:
+        return False
+    return True
+
+
+def _pack_cell(cell: sudoku.Cell) -> int:
+    if cell.value:
+        return cell.value << _VALUE_SHIFT | (_GIVEN_FLAG if cell.is_given else 0)
+    return cell.candidates_mask
+
+
+def _pack_encoded_cell(c: str) -> int:
+    if c[0] == "-":
+        return int(c[1:]) << _VALUE_SHIFT | _GIVEN_FLAG
+    if c[0] == "+":
+        return int(c[1:]) << _VALUE_SHIFT
+    return int(c)
+
+
+def _unpack_encoded_cell(word: int) -> str:
+    if word & _GIVEN_FLAG:
+        return f"-{word >> _VALUE_SHIFT & 0xF}"
+    if value := word >> _VALUE_SHIFT:
+        return f"+{value}"
+    return str(word)
@@ -0,0 +1,170 @@
+from hashlib import blake2b
+from itertools import permutations, product
+from typing import Iterable, Sequence
+
+from .. import sudoku
+
+# minimized cells keys: relabeled digits 1-9, empty cells sort after them
+_EMPTY_KEY = 10
+# tied transforms kept per row. Only highly symmetric, nearly empty givens reach it,
+# their canonical form is still a class member but may differ between equivalent givens
+MAX_STATES = 4096
+
+
+class SymmetryTransform:
+    """Validity preserving Sudoku transform: optional transpose, rows and columns permutations
+    within bands and stacks, bands and stacks permutations and digits relabeling.
+    Canonical cell r*9+c takes the (transposed) source cell rows[r]*9+columns[c], digit d becomes labels[d]
+    """
+
+    __slots__ = ("columns", "labels", "rows", "transpose")
+
+    def __init__(self, transpose: bool, rows: Sequence[int], columns: Sequence[int], labels: Sequence[int]):
+        self.transpose = transpose
+        self.rows = tuple(rows)
+        self.columns = tuple(columns)
+        self.labels = tuple(labels)
+
+    def __repr__(self) -> str:
+        return f"SymmetryTransform({self.transpose}, {self.rows}, {self.columns}, {self.labels})"
+
+    def apply(self, values: Sequence[int]) -> tuple[int, ...]:
+        """Source 81 cells values to the canonical form, 0 is an empty cell"""
+        if self.transpose:
+            values = _transpose(values)
+        labels = self.labels
+        return tuple(labels[values[row * 9 + col]] for row in self.rows for col in self.columns)
+
+    def revert(self, values: Sequence[int]) -> tuple[int, ...]:
+        """Canonical 81 cells values back to the source form"""
+        digits = [0] * 10
+        for digit, label in enumerate(self.labels):
+            digits[label] = digit
+        result = [0] * 81
+        for r, row in enumerate(self.rows):
+            for c, col in enumerate(self.columns):
+                result[row * 9 + col] = digits[values[r * 9 + c]]
+        return _transpose(result) if self.transpose else tuple(result)
+
+
+def canonicalize(givens: Sequence[int]) -> tuple[tuple[int, ...], SymmetryTransform]:
+    """Canonical representative of the givens equivalence class under the Sudoku symmetry group
+    and the transform mapping the givens to it.
+    The representative is the lexicographically smallest transformed givens, empty cells ordered after digits.
+    Rows are chosen one by one keeping only transforms with the smallest prefix,
+    column permutations are fixed by the first row: only ones tied on it are tried.
+    Exact unless more than MAX_STATES transforms tie
+    """
+    sources = (tuple(givens), _transpose(givens))
+    # state: transpose, chosen rows, columns, labels by source digit, next label
+    states: list[tuple[int, tuple[int, ...], tuple[int, ...], list[int], int]] = []
+    best_key: tuple[int, ...] | None = None
+    for transpose, values in enumerate(sources):
+        for row in range(9):
+            key = _get_first_row_key(values, row)
+            if best_key is None or key < best_key:
+                best_key = key
+                states = []
+            if key == best_key:
+                for columns in _get_first_row_columns(values, row):
+                    if len(states) >= MAX_STATES:
+                        break
+                    labels = [0] * 10
+                    label = 1
+                    for col in columns:
+                        if digit := values[row * 9 + col]:
+                            labels[digit] = label
+                            label += 1
+                    states.append((transpose, (row,), columns, labels, label))
+    for position in range(1, 9):
+        next_states: list[tuple[int, tuple[int, ...], tuple[int, ...], list[int], int]] = []
+        best_key = None
+        for transpose, rows, columns, labels, label in states:
+            values = sources[transpose]
+            for row in _get_next_rows(rows, position):
+                row_labels = labels
+                row_label = label
+                key_items = []
+                for col in columns:
+                    digit = values[row * 9 + col]
+                    if not digit:
+                        key_items.append(_EMPTY_KEY)
+                        continue
+                    if not row_labels[digit]:
+                        if row_labels is labels:
+                            row_labels = labels.copy()
+                        row_labels[digit] = row_label
+                        row_label += 1
+                    key_items.append(row_labels[digit])
+                key = tuple(key_items)
+                if best_key is None or key < best_key:
+                    best_key = key
+                    next_states = []
+                if key == best_key and len(next_states) < MAX_STATES:
+                    next_states.append((transpose, rows + (row,), columns, row_labels, row_label))
+        states = next_states
+    transpose, rows, columns, labels, label = states[0]
+    # digits missing from givens take the remaining labels, so solutions can be transformed too
+    for digit in range(1, 10):
+        if not labels[digit]:
+            labels[digit] = label
+            label += 1
+    transform = SymmetryTransform(bool(transpose), rows, columns, labels)
+    return transform.apply(givens), transform
+
+
+def canonicalize_grid(grid: sudoku.Grid) -> tuple[tuple[int, ...], SymmetryTransform]:
+    return canonicalize(grid.state.givens)
+
+
+def get_canonical_key(givens: Sequence[int]) -> str:
+    """Canonical givens as an 81 digits string, equal for transformed copies of a puzzle"""
+    return "".join(map(str, canonicalize(givens)[0]))
+
+
+def get_canonical_digest(givens: Sequence[int]) -> str:
+    """get_canonical_key hashed to 32 hex digits, to store and look up transformed copies of a puzzle"""
+    return blake2b(get_canonical_key(givens).encode("ascii"), digest_size=16).hexdigest()
+
+
+def _transpose(values: Sequence[int]) -> tuple[int, ...]:
+    return tuple(values[col * 9 + row] for row in range(9) for col in range(9))
+
+
+def _get_first_row_key(values: Sequence[int], row: int) -> tuple[int, ...]:
+    """Smallest first row key: stacks with more givens first, givens first within a stack"""
+    counts = sorted((sum(1 for col in range(stack * 3, stack * 3 + 3) if values[row * 9 + col]) for stack in range(3)))
+    key: list[int] = []
+    label = 1
+    for count in reversed(counts):
+        key.extend(range(label, label + count))
+        key.extend([_EMPTY_KEY] * (3 - count))
+        label += count
+    return tuple(key)
+
+
+def _get_first_row_columns(values: Sequence[int], row: int) -> Iterable[tuple[int, ...]]:
+    """Columns orders giving the smallest first row key"""
+    stacks = [
+        ([col for col in cols if values[row * 9 + col]], [col for col in cols if not values[row * 9 + col]])
+        for cols in (range(stack * 3, stack * 3 + 3) for stack in range(3))
+    ]
+    for stacks_order in permutations(stacks):
+        counts = [len(given) for given, _ in stacks_order]
+        if counts != sorted(counts, reverse=True):
+            continue
+        stack_columns = [
+            [given_order + empty_order for given_order in permutations(given) for empty_order in permutations(empty)]
+            for given, empty in stacks_order
+        ]
+        for first, second, third in product(*stack_columns):
+            yield first + second + third
+
+
+def _get_next_rows(rows: tuple[int, ...], position: int) -> Iterable[int]:
+    """Rows that can take the position: same band as the previous row, or the first row of an unused band"""
+    if position % 3:
+        band = rows[-1] // 3
+        return (row for row in range(band * 3, band * 3 + 3) if row not in rows)
+    used_bands = {row // 3 for row in rows}
+    return (row for row in range(9) if row // 3 not in used_bands)
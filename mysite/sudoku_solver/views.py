@@ -1,22 +1,34 @@
+import asyncio
 import json
-from typing import Any
+from typing import Any, AsyncIterator, Collection
 
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import LoginView, LogoutView, PasswordChangeView
+from django.db.models import BinaryField
+from django.db.models.functions import Cast
 from django.db.models.query import QuerySet
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
 from django.views import generic
 from django.views.decorators.http import require_http_methods
 
-from . import forms, mixins, models
-from .solver import BruteForcer, Solver, SolverException, StepSolver
-from .sudoku import SudokuException
+from . import forms, mixins, models, solving
+from .solver_pool import SolverPoolException, SolverPoolTimeout
 from .utils import board_utils
 
+MAX_SOLUTIONS_LIMIT = 100
+# request and result boards: comma separated encoding or base64 packed bytes
+TEXT_FORMAT = "text"
+PACKED_FORMAT = "packed"
+BOARD_FORMATS = (TEXT_FORMAT, PACKED_FORMAT)
+# boards export: board records as JSON lines or givens as 81 digits lines
+NDJSON_EXPORT = "ndjson"
+LINES_EXPORT = "lines"
+EXPORT_CHUNK_SIZE = 2000
+
 
 class HomePageView(mixins.RedirectAuthenticatedMixin, generic.TemplateView):
     template_name = "index.html"
@@ -64,16 +76,11 @@ class BoardList(LoginRequiredMixin, generic.ListView):
         return context
 
 
-class BoardCreate(LoginRequiredMixin, generic.CreateView):
+class BoardCreate(mixins.BoardAnalysisMixin, generic.CreateView):  # type: ignore[misc]  # async handlers
     model = models.Board
     form_class = forms.BoardForm
     template_name = "board-list-create.html"
 
-    def get_form_kwargs(self) -> dict[str, Any]:
-        kwargs = super().get_form_kwargs()
-        kwargs["user"] = self.request.user
-        return kwargs
-
     def get_success_url(self) -> str:
         return reverse_lazy("sudoku-solver:board-detail", kwargs={"board_id": self.object.id})
 
@@ -87,18 +94,13 @@ class BoardDetail(LoginRequiredMixin, generic.DetailView):
         return get_object_or_404(queryset or self.model, id=self.kwargs.get("board_id"), user=self.request.user)
 
 
-class BoardUpdate(LoginRequiredMixin, generic.UpdateView):
+class BoardUpdate(mixins.BoardAnalysisMixin, generic.UpdateView):  # type: ignore[misc]  # async handlers
     model = models.Board
     template_name = "board-update.html"
     context_object_name = "board_object"
     # fields = ["description", "board"]
     form_class = forms.BoardForm
 
-    def get_form_kwargs(self) -> dict[str, Any]:
-        kwargs = super().get_form_kwargs()
-        kwargs["user"] = self.request.user
-        return kwargs
-
     def get_object(self, queryset: QuerySet[models.Board] | None = None) -> models.Board:
         board = get_object_or_404(queryset or self.model, id=self.kwargs.get("board_id"), user=self.request.user)
         board.board = "".join(c[1:] if c.startswith("-") else "0" for c in board.board.split(","))
@@ -118,26 +120,98 @@ class BoardDelete(LoginRequiredMixin, generic.DeleteView):
         return get_object_or_404(queryset or self.model, id=self.kwargs.get("board_id"), user=self.request.user)
 
 
+@login_required()
+@require_http_methods(["GET"])
+async def export_boards(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse | StreamingHttpResponse:
+    export_format = request.GET.get("format", NDJSON_EXPORT)
+    if export_format == NDJSON_EXPORT:
+        content_type, filename = "application/x-ndjson", "boards.ndjson"
+    elif export_format == LINES_EXPORT:
+        content_type, filename = "text/plain; charset=ascii", "boards.txt"
+    else:
+        return JsonResponse({"error": f"expected format: {NDJSON_EXPORT} or {LINES_EXPORT}"}, status=400)
+    boards = models.Board.objects.filter(user=await request.auser()).order_by("id")
+    response = StreamingHttpResponse(_export_boards(boards, export_format), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+async def _export_boards(boards: QuerySet[models.Board], export_format: str) -> AsyncIterator[str]:
+    """Export lines joined by chunks, rows read with a server side cursor where the database supports it"""
+    chunk: list[str] = []
+    async for line in _get_export_lines(boards, export_format):
+        chunk.append(line)
+        if len(chunk) >= EXPORT_CHUNK_SIZE:
+            yield "\n".join(chunk) + "\n"
+            chunk.clear()
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+async def _get_export_lines(boards: QuerySet[models.Board], export_format: str) -> AsyncIterator[str]:
+    # boards are selected packed, skipping the field conversion to the encoding
+    boards = boards.annotate(packed=Cast("board", output_field=BinaryField()))
+    if export_format == LINES_EXPORT:
+        async for packed in boards.values_list("packed", flat=True).aiterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield board_utils.unpack_givens(bytes(packed))
+        return
+    # values, not values_list: the values list iterable runs its query on creation, outside aiterator thread
+    rows = boards.values("id", "description", "packed", "created", "changed", "solution_count", "difficulty")
+    async for row in rows.aiterator(chunk_size=EXPORT_CHUNK_SIZE):
+        packed = bytes(row.pop("packed"))
+        row["board"] = board_utils.unpack_encoded(packed)
+        row["givens"] = board_utils.unpack_givens(packed)
+        row["created"] = row["created"].isoformat()
+        row["changed"] = row["changed"] and row["changed"].isoformat()
+        yield json.dumps(row)
+
+
 @login_required()
 @require_http_methods(["PATCH"])
-def update_board(request: HttpRequest, board_id: int, *args: Any, **kwargs: Any) -> HttpResponse:
+async def update_board(request: HttpRequest, board_id: int, *args: Any, **kwargs: Any) -> HttpResponse:
     try:
         request_data = json.loads(request.body)
     except json.JSONDecodeError:
         return JsonResponse({"error": "Invalid JSON"}, status=400)
     board = request_data.get("board")
     description = request_data.get("description")
+    board_format = request_data.get("format", TEXT_FORMAT)
+    if board_format not in BOARD_FORMATS:
+        return _board_format_error_response()
     if board and not isinstance(board, str):
         return JsonResponse({"error": "expected board format: string"}, status=400)
+    parsed: board_utils.ParsedBoard | None = None
+    if board:
+        try:
+            if board_format == PACKED_FORMAT:
+                if (packed := solving.decode_packed(board)) is None:
+                    return JsonResponse({"error": "board is invalid: invalid base64"}, status=400)
+                parsed = board_utils.parse_packed(packed)
+                board = parsed.encode()
+            else:
+                parsed = board_utils.parse_board(board)
+        except board_utils.BoardParseError as e:
+            return JsonResponse({"error": f"board is invalid: {e}"}, status=400)
     if description and not isinstance(description, str):
         return JsonResponse({"error": "expected description format: string"}, status=400)
     if not board and not description:
         return JsonResponse({"reason": "no changes"}, status=200)
-    board_data = get_object_or_404(models.Board, id=board_id, user=request.user)
+    try:
+        board_data = await models.Board.objects.aget(id=board_id, user=await request.auser())
+    except models.Board.DoesNotExist:
+        raise Http404("No Board matches the given query.")
     changed = False
-    if board and board != board_data.board:
-        if not board_utils.is_valid_encoding(board):
-            return JsonResponse({"error": "board is invalid"}, status=400)
+    if parsed is not None and board != board_data.board:
+        givens = tuple(parsed.givens)
+        # unanalyzed rows (imported or edited in the admin) get the analysis of the uniqueness check too
+        if givens != board_data.givens or board_data.solution_count is None:
+            try:
+                analysis = await solving.aoffload_analyze_givens(givens)
+            except SolverPoolException as e:
+                return _solver_pool_error_response(e)
+            if analysis["solution_count"] != 1:
+                return JsonResponse({"error": "board must have exactly one solution"}, status=400)
+            board_data.set_analysis(givens, analysis)
         board_data.board = board
         changed = True
     if description and description != board_data.description:
@@ -145,23 +219,129 @@ def update_board(request: HttpRequest, board_id: int, *args: Any, **kwargs: Any)
         changed = True
     if not changed:
         return JsonResponse({"reason": "no changes"}, status=200)
-    board_data.save()
+    await board_data.asave()
     return HttpResponse(status=204)
 
 
 @login_required()
 @require_http_methods(["POST"])
-def solve_step(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
-    return _solve_helper(StepSolver, request)
+async def solve_step(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+    return await _solve_helper(solving.STEP_ENGINE, request)
+
+
+@login_required()
+@require_http_methods(["POST"])
+async def solve_logically(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+    try:
+        request_data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    board_format = request_data.get("format", TEXT_FORMAT)
+    if board_format not in BOARD_FORMATS:
+        return _board_format_error_response()
+    board = request_data.get("board")
+    if not board:
+        return JsonResponse({"error": "board is required"}, status=400)
+    # strict (default): simplest strategy at each step, otherwise the one the scheduler expects to find fastest
+    strict = request_data.get("strict", True)
+    if not isinstance(strict, bool):
+        return JsonResponse({"error": "strict must be a boolean"}, status=400)
+    try:
+        result = await solving.aoffload_solve_logically(_decode_request_board(board, board_format), strict)
+    except SolverPoolException as e:
+        return _solver_pool_error_response(e)
+    if result["status"] in ("invalid", "error"):
+        return JsonResponse({"error": result["error"]}, status=400)
+    return JsonResponse({"solved": result["status"] == "solved", "result": result["result"], "steps": result["steps"]})
+
+
+@login_required()
+@require_http_methods(["POST"])
+async def hint(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+    try:
+        request_data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    board_format = request_data.get("format", TEXT_FORMAT)
+    if board_format not in BOARD_FORMATS:
+        return _board_format_error_response()
+    board = request_data.get("board")
+    if not board:
+        return JsonResponse({"error": "board is required"}, status=400)
+    board = _decode_request_board(board, board_format)
+    if not isinstance(board, (str, bytes)):
+        return JsonResponse({"error": "board is invalid"}, status=400)
+    try:
+        # packed, so both formats of a board state share the cached hint
+        packed = board_utils.parse_board_data(board).pack()
+    except board_utils.BoardParseError as e:
+        return JsonResponse({"error": f"board is invalid: {e}"}, status=400)
+    try:
+        result = await solving.aoffload_get_hint(packed)
+    except SolverPoolException as e:
+        return _solver_pool_error_response(e)
+    if result is None:
+        return JsonResponse({"reason": "No hint found"}, status=200)
+    return JsonResponse({"hint": result}, status=200)
+
+
+@login_required()
+@require_http_methods(["GET", "POST"])
+async def solver_profiling(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+    """Staff only. GET: solver pool profiles. POST {"action": "enable" | "disable" | "reset"}"""
+    if not (await request.auser()).is_staff:
+        return JsonResponse({"error": "staff only"}, status=403)
+    if request.method == "GET":
+        return JsonResponse({"profiles": await asyncio.to_thread(solving.get_pool_profiles)})
+    try:
+        request_data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    action = request_data.get("action") if isinstance(request_data, dict) else None
+    if action in ("enable", "disable"):
+        workers = await asyncio.to_thread(solving.set_pool_profiling, action == "enable")
+    elif action == "reset":
+        workers = await asyncio.to_thread(solving.reset_pool_profiles)
+    else:
+        return JsonResponse({"error": "expected action: enable, disable or reset"}, status=400)
+    return JsonResponse({"action": action, "workers": workers})
+
+
+@login_required()
+@require_http_methods(["POST"])
+async def solve(request: HttpRequest, *args: Any, board_id: int | None = None, **kwargs: Any) -> HttpResponse:
+    if board_id is not None and (response := await _get_stored_solution_response(request, board_id)) is not None:
+        return response
+    return await _solve_helper(solving.DEFAULT_ENGINE, request, engines=solving.SOLVE_ENGINES)
 
 
 @login_required()
 @require_http_methods(["POST"])
-def solve(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
-    return _solve_helper(BruteForcer, request)
+async def solve_batch(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+    try:
+        request_data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    boards = request_data.get("boards")
+    if not boards or not isinstance(boards, list):
+        return JsonResponse({"error": "boards list is required"}, status=400)
+    max_size = solving.get_batch_max_size()
+    if len(boards) > max_size:
+        return JsonResponse({"error": f"boards count exceeds {max_size}"}, status=400)
+    engine = request_data.get("engine", solving.DEFAULT_ENGINE)
+    engines = solving.SOLVE_ENGINES
+    if not isinstance(engine, str) or engine not in engines:
+        return JsonResponse({"error": f"engine is invalid, expected one of: {sorted(engines)}"}, status=400)
+    board_format = request_data.get("format", TEXT_FORMAT)
+    if board_format not in BOARD_FORMATS:
+        return _board_format_error_response()
+    boards = [_decode_request_board(board, board_format) for board in boards]
+    return JsonResponse({"results": await solving.aoffload_solve_boards(boards, engine)}, status=200)
 
 
-def _solve_helper(solver_class: type[Solver], request: HttpRequest) -> JsonResponse:
+@login_required()
+@require_http_methods(["POST"])
+async def check_unique(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
     try:
         request_data = json.loads(request.body)
     except json.JSONDecodeError:
@@ -172,9 +352,85 @@ def _solve_helper(solver_class: type[Solver], request: HttpRequest) -> JsonRespo
     if not isinstance(board, str):
         return JsonResponse({"error": "board is invalid"}, status=400)
     try:
-        grid = board_utils.decode_board(board)
-        if solver_class(grid).solve():
-            return JsonResponse({"result": board_utils.encode_board(grid)}, status=200)
-    except (SudokuException, SolverException) as e:
-        return JsonResponse({"error": str(e)}, status=400)
-    return JsonResponse({"reason": "No solution found"}, status=200)
+        givens = board_utils.parse_board(board).givens
+    except board_utils.BoardParseError as e:
+        return JsonResponse({"error": f"board is invalid: {e}"}, status=400)
+    limit = request_data.get("limit", 2)
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit not in range(1, MAX_SOLUTIONS_LIMIT + 1):
+        return JsonResponse({"error": f"limit must be an integer in [1, {MAX_SOLUTIONS_LIMIT}]"}, status=400)
+    try:
+        solutions = await solving.aoffload_count_solutions(givens, limit)
+    except SolverPoolException as e:
+        return _solver_pool_error_response(e)
+    return JsonResponse({"solutions": solutions, "unique": solutions == 1, "limit_reached": solutions >= limit})
+
+
+async def _solve_helper(default_engine: str, request: HttpRequest, *, engines: Collection[str] = ()) -> JsonResponse:
+    try:
+        request_data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    engine = request_data.get("engine", default_engine)
+    accepted_engines = {default_engine, *engines}
+    if not isinstance(engine, str) or engine not in accepted_engines:
+        return JsonResponse({"error": f"engine is invalid, expected one of: {sorted(accepted_engines)}"}, status=400)
+    board_format = request_data.get("format", TEXT_FORMAT)
+    if board_format not in BOARD_FORMATS:
+        return _board_format_error_response()
+    board = request_data.get("board")
+    if not board:
+        return JsonResponse({"error": "board is required"}, status=400)
+    try:
+        result = await solving.aoffload_solve_board(_decode_request_board(board, board_format), engine)
+    except SolverPoolException as e:
+        return _solver_pool_error_response(e)
+    match result["status"]:
+        case "solved":
+            return JsonResponse({"result": result["result"]}, status=200)
+        case "unsolved":
+            return JsonResponse({"reason": result["reason"]}, status=200)
+        case _:
+            return JsonResponse({"error": result["error"]}, status=400)
+
+
+async def _get_stored_solution_response(request: HttpRequest, board_id: int) -> JsonResponse | None:
+    """Solve result from the saved board solution, None when it can't be used"""
+    try:
+        request_data = json.loads(request.body)
+        board = _decode_request_board(request_data.get("board"), request_data.get("format", TEXT_FORMAT))
+    except (json.JSONDecodeError, AttributeError):
+        return None
+    if not isinstance(board, (str, bytes)):
+        return None
+    try:
+        givens = tuple(board_utils.parse_board_data(board).givens)
+    except board_utils.BoardParseError:
+        return None
+    board_data = (
+        await models.Board.objects.filter(id=board_id, user=await request.auser())
+        .only("board", "solution", "solution_count")
+        .afirst()
+    )
+    if board_data is None or (solution := board_data.stored_solution) is None:
+        return None
+    if givens != board_data.givens:
+        return None
+    result = solving.get_solution_result(givens, solution, packed=isinstance(board, bytes))
+    return JsonResponse({"result": result["result"]}, status=200)
+
+
+def _decode_request_board(board: object, board_format: object) -> object:
+    """Board to solve: packed bytes for the packed format, None for invalid base64"""
+    if board_format == PACKED_FORMAT and isinstance(board, str):
+        return solving.decode_packed(board)
+    return board
+
+
+def _board_format_error_response() -> JsonResponse:
+    return JsonResponse({"error": f"format is invalid, expected one of: {list(BOARD_FORMATS)}"}, status=400)
+
+
+def _solver_pool_error_response(e: SolverPoolException) -> JsonResponse:
+    if isinstance(e, SolverPoolTimeout):
+        return JsonResponse({"error": "Solve timed out"}, status=504)
+    return JsonResponse({"error": "Solver is unavailable"}, status=503)